@@ -4,6 +4,7 @@ Modify these values to customize the trading behavior
 """
 
 import os
+from dataclasses import dataclass
 from typing import Optional
 
 # Telegram and Token Configuration
@@ -36,31 +37,44 @@ SLIPPAGE_LEVELS = [500, 1000, 2000, 5000]  # 5%, 10%, 20%, 50%
 LOG_LEVEL = 'INFO'  # DEBUG, INFO, WARNING, ERROR
 LOG_FILE = None  # None for console only, or filename for file logging
 
-# Database Configuration
-DATABASE_URL = os.getenv('DATABASE_URL')
-DIRECT_URL = os.getenv('DIRECT_URL')
+# Environment-derived configuration, read once at import and frozen
+@dataclass(frozen=True, slots=True)
+class EnvConfig:
+    DATABASE_URL: Optional[str]
+    DIRECT_URL: Optional[str]
+    HELIUS_API_KEY: Optional[str]
+    JUPITER_API_KEY: Optional[str]
+
+    def validate(self):
+        """Check that all required environment values are present"""
+        missing_vars = [
+            name for name in ('DATABASE_URL', 'DIRECT_URL', 'HELIUS_API_KEY')
+            if not getattr(self, name)
+        ]
+        if missing_vars:
+            raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
+
+
+CONFIG = EnvConfig(
+    DATABASE_URL=os.getenv('DATABASE_URL'),
+    DIRECT_URL=os.getenv('DIRECT_URL'),
+    HELIUS_API_KEY=os.getenv('HELIUS_API_KEY'),
+    JUPITER_API_KEY=os.getenv('JUPITER_API_KEY'),
+)
+
+# Database Configuration (module-level aliases kept for compatibility)
+DATABASE_URL = CONFIG.DATABASE_URL
+DIRECT_URL = CONFIG.DIRECT_URL
 
 # API Configuration
-HELIUS_API_KEY = os.getenv('HELIUS_API_KEY')
-JUPITER_API_KEY = os.getenv('JUPITER_API_KEY')
+HELIUS_API_KEY = CONFIG.HELIUS_API_KEY
+JUPITER_API_KEY = CONFIG.JUPITER_API_KEY
 
 # Validation
 def validate_config():
     """Validate that all required configuration values are set"""
-    required_vars = [
-        'DATABASE_URL',
-        'DIRECT_URL', 
-        'HELIUS_API_KEY'
-    ]
-    
-    missing_vars = []
-    for var in required_vars:
-        if not globals().get(var):
-            missing_vars.append(var)
-    
-    if missing_vars:
-        raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
-    
+    CONFIG.validate()
+
     # Validate numeric ranges
     if not (0 < BALANCE_PERCENTAGE <= 1):
         raise ValueError(f"BALANCE_PERCENTAGE must be between 0 and 1, got {BALANCE_PERCENTAGE}")
@@ -1,21 +1,27 @@
 #!/usr/bin/env python3
 
+import functools
+import sys
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import pandas as pd
 import numpy as np
-from rich.console import Console
-from rich.table import Table
 from prisma import Prisma
-from core.strategy_interface import Candle, Position, StrategyConfig
+from core.strategy_interface import BUY, BuySignal, Candle, Position, SellSignal, StrategyConfig, HOLD
 from core.strategy_factory import StrategyFactory
+from core.backtest_kernel import build_equity_curve, candles_to_arrays
 from core.plotter import plot_trading_signals
 from utils.debugger import Debugger
 
-console = Console()
 
-@dataclass
+@functools.cache
+def _console():
+    # Rich is import-heavy; only pay for it when results are displayed
+    from rich.console import Console
+    return Console()
+
+@dataclass(slots=True)
 class BacktestPosition:
     id: int
     entry_price: float
@@ -26,7 +32,7 @@ class BacktestPosition:
     pnl: Optional[float] = None
     exit_reason: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class BacktestResult:
     total_trades: int
     winning_trades: int
@@ -46,74 +52,90 @@ class BacktestResult:
 class Backtester:
     def __init__(self, strategy_name: str, token_id: int, initial_capital: float = 1000.0):
         self.strategy = StrategyFactory.create_strategy(strategy_name)
-        self.config = StrategyConfig(
-            name=self.strategy.get_config().name,
-            token_id=token_id,
-            lookback_periods=self.strategy.get_config().lookback_periods,
-            balance_percentage=self.strategy.get_config().balance_percentage,
-            default_slippage_bps=self.strategy.get_config().default_slippage_bps,
-            min_trade_size_sol=self.strategy.get_config().min_trade_size_sol,
-            fee_buffer_sol=self.strategy.get_config().fee_buffer_sol,
-            rent_buffer_sol=self.strategy.get_config().rent_buffer_sol,
-            loop_delay_ms=self.strategy.get_config().loop_delay_ms
-        )
+        # The backtest config is the strategy's config with the token overridden
+        self.config = replace(self.strategy.get_config(), token_id=token_id)
         self.initial_capital = initial_capital
         self.debug = Debugger.getInstance()
         self.current_position: Optional[BacktestPosition] = None
+        self.current_position_obj: Optional[Position] = None
         self.positions: List[BacktestPosition] = []
         self.equity_curve: List[float] = [initial_capital]
         self.timestamps: List[datetime] = []
         self.last_exit_time: Optional[datetime] = None
         self.position_id_counter = 1
+        self._realized_pnl = 0.0
+        self.pnl_curve: Optional[np.ndarray] = None
+        self._candles_cache: Optional[List[Candle]] = None
 
-    def get_historical_data(self, prisma: Prisma) -> List[Candle]:
+    def get_historical_data_frame(self, prisma: Prisma) -> pd.DataFrame:
+        """Fetch OHLCV history as a columnar DataFrame via raw SQL, skipping
+        per-row ORM model materialization."""
         try:
-            ohlcv = prisma.tokenohlcv.find_many(
-                where={
-                    'tokenId': self.config.token_id,
-                    'interval': '1s'
-                },
-                order=[{'timestamp': 'asc'}]
+            rows = prisma.query_raw(
+                'SELECT "timestamp", "open", "high", "low", "close", "volumeUSD" AS volume '
+                'FROM "TokenOHLCV" WHERE "tokenId" = $1 AND "interval" = $2 ORDER BY "timestamp" ASC',
+                self.config.token_id,
+                '1s'
             )
-            if len(ohlcv) < self.config.lookback_periods + 10:
-                raise ValueError(f"Insufficient historical data. Need at least {self.config.lookback_periods + 10} candles, got {len(ohlcv)}")
-            return [
-                Candle(
-                    timestamp=row.timestamp,
-                    open=row.open,
-                    high=row.high,
-                    low=row.low,
-                    close=row.close,
-                    volume=row.volumeUSD
-                )
-                for row in ohlcv
-            ]
+            df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            if len(df) < self.config.lookback_periods + 10:
+                raise ValueError(f"Insufficient historical data. Need at least {self.config.lookback_periods + 10} candles, got {len(df)}")
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            return df
         except Exception as e:
             self.debug.error(f"Error fetching historical data: {str(e)}")
             raise
 
-    def should_buy(self, lookback_candles: List[Candle], curr_candle: Candle) -> Dict[str, Any]:
-        return self.strategy.should_buy({
+    def get_historical_data(self, prisma: Prisma) -> List[Candle]:
+        # Cache per run: the same history is needed again for plotting
+        if self._candles_cache is not None:
+            return self._candles_cache
+        df = self.get_historical_data_frame(prisma)
+        self._candles_cache = [
+            Candle(
+                timestamp=ts,
+                open=o,
+                high=h,
+                low=l,
+                close=c,
+                volume=v
+            )
+            for ts, o, h, l, c, v in zip(
+                df['timestamp'], df['open'], df['high'], df['low'], df['close'], df['volume']
+            )
+        ]
+        return self._candles_cache
+
+    def should_buy(self, lookback_candles: List[Candle], curr_candle: Candle) -> BuySignal:
+        signal = self.strategy.should_buy({
             'lookback': lookback_candles,
             'curr': curr_candle,
-            'last_exit_time': self.last_exit_time
+            'last_exit_time': self.last_exit_time,
+            # Candle time, not wall-clock: keeps backtests deterministic and
+            # skips a syscall per bar
+            'now': curr_candle.timestamp
         })
+        if isinstance(signal, BuySignal):
+            return signal
+        # Legacy dict contract from older strategies
+        return BuySignal(BUY if signal['action'] == 'buy' else HOLD, signal.get('info', ''))
 
-    def should_sell(self, curr_candle: Candle) -> Dict[str, Any]:
+    def should_sell(self, curr_candle: Candle, lookback_candles: Optional[List[Candle]] = None) -> SellSignal:
         if not self.current_position:
-            return {'shouldSell': False, 'reason': 'No position', 'info': ''}
-        position = self.strategy.create_position(
-            self.current_position.id,
-            self.current_position.entry_price,
-            self.current_position.entry_time,
-            self.current_position.size
-        )
-        return self.strategy.should_sell({
-            'position': position,
+            return SellSignal(False, 'No position')
+        signal = self.strategy.should_sell({
+            'position': self.current_position_obj,
             'curr': curr_candle,
             'entry_price': self.current_position.entry_price,
-            'entry_time': self.current_position.entry_time
+            'entry_time': self.current_position.entry_time,
+            # Indicator-based exits (EMA gradient, local maxima) need the
+            # window, not just the current bar
+            'lookback': lookback_candles if lookback_candles is not None else [],
+            'now': curr_candle.timestamp
         })
+        if isinstance(signal, SellSignal):
+            return signal
+        return SellSignal(signal['shouldSell'], signal.get('reason', ''), signal.get('info', ''))
 
     def open_position(self, price: float, timestamp: datetime) -> None:
         self.current_position = BacktestPosition(
@@ -122,6 +144,13 @@ class Backtester:
             entry_time=timestamp,
             size=1.0
         )
+        # Build the strategy-facing Position once; entry state never changes
+        self.current_position_obj = self.strategy.create_position(
+            self.current_position.id,
+            price,
+            timestamp,
+            1.0
+        )
         self.position_id_counter += 1
 
     def close_position(self, price: float, timestamp: datetime, reason: str) -> None:
@@ -129,21 +158,37 @@ class Backtester:
             return
         self.current_position.exit_price = price
         self.current_position.exit_time = timestamp
-        self.current_position.exit_reason = reason
+        # Reasons repeat across trades ('stop_loss', 'take_profit', ...); intern
+        # so every occurrence shares one string object
+        self.current_position.exit_reason = sys.intern(reason) if reason else reason
         self.current_position.pnl = (price - self.current_position.entry_price) * self.current_position.size
+        self._realized_pnl += self.current_position.pnl
         self.positions.append(self.current_position)
         self.current_position = None
+        self.current_position_obj = None
         self.last_exit_time = timestamp
 
+    def _preallocate_equity_curve(self, n_bars: int) -> None:
+        """Preallocate a float64 PnL-delta array sized for the whole run
+        (+1 initial point, +1 possible end-of-run close). Initial capital is
+        added back as a single broadcast when the run finishes."""
+        self.pnl_curve = np.empty(n_bars + 2, dtype=np.float64)
+        self.pnl_curve[0] = 0.0
+        self._bar = 1
+
+    def _finalize_equity_curve(self) -> None:
+        self.equity_curve = self.initial_capital + self.pnl_curve[:self._bar]
+
     def update_equity_curve(self, current_price: float, timestamp: datetime) -> None:
-        current_equity = self.initial_capital
-        for position in self.positions:
-            if position.pnl is not None:
-                current_equity += position.pnl
+        # Closed PnL is immutable, so track it incrementally instead of re-summing positions
+        pnl = self._realized_pnl
         if self.current_position:
-            unrealized_pnl = (current_price - self.current_position.entry_price) * self.current_position.size
-            current_equity += unrealized_pnl
-        self.equity_curve.append(current_equity)
+            pnl += (current_price - self.current_position.entry_price) * self.current_position.size
+        if self.pnl_curve is not None:
+            self.pnl_curve[self._bar] = pnl
+            self._bar += 1
+        else:
+            self.equity_curve.append(self.initial_capital + pnl)
         self.timestamps.append(timestamp)
 
     def calculate_metrics(self) -> BacktestResult:
@@ -165,30 +210,38 @@ class Backtester:
                 timestamps=self.timestamps
             )
         total_trades = len(self.positions)
-        winning_trades = len([p for p in self.positions if p.pnl and p.pnl > 0])
-        losing_trades = len([p for p in self.positions if p.pnl and p.pnl < 0])
+        # Single NumPy pass over closed PnLs instead of repeated list comprehensions
+        pnls = np.fromiter(
+            (p.pnl if p.pnl is not None else 0.0 for p in self.positions),
+            dtype=np.float64,
+            count=total_trades
+        )
+        winning_trades = int((pnls > 0).sum())
+        losing_trades = int((pnls < 0).sum())
         win_rate = winning_trades / total_trades if total_trades > 0 else 0.0
-        total_pnl = sum(p.pnl for p in self.positions if p.pnl is not None)
+        total_pnl = float(pnls.sum())
         avg_pnl_per_trade = total_pnl / total_trades if total_trades > 0 else 0.0
-        hold_times = []
-        for position in self.positions:
-            if position.exit_time and position.entry_time:
-                hold_time = position.exit_time - position.entry_time
-                hold_times.append(hold_time)
-        avg_hold_time = sum(hold_times, timedelta(0)) / len(hold_times) if hold_times else timedelta(0)
-        max_drawdown = 0.0
-        peak = self.initial_capital
-        for equity in self.equity_curve:
-            if equity > peak:
-                peak = equity
-            drawdown = (peak - equity) / peak if peak > 0 else 0.0
-            max_drawdown = max(max_drawdown, drawdown)
-        if len(self.equity_curve) > 1:
-            returns = np.diff(self.equity_curve) / self.equity_curve[:-1]
-            sharpe_ratio = np.mean(returns) / np.std(returns) if np.std(returns) > 0 else 0.0
+        closed = [p for p in self.positions if p.exit_time and p.entry_time]
+        if closed:
+            entry_ns = pd.DatetimeIndex([p.entry_time for p in closed]).as_unit('ns').asi8
+            exit_ns = pd.DatetimeIndex([p.exit_time for p in closed]).as_unit('ns').asi8
+            avg_hold_time = timedelta(microseconds=float((exit_ns - entry_ns).mean()) / 1000.0)
+        else:
+            avg_hold_time = timedelta(0)
+        # Vectorized running-peak drawdown and Sharpe from a single equity array
+        eq = np.asarray(self.equity_curve, dtype=np.float64)
+        peaks = np.maximum.accumulate(np.maximum(eq, self.initial_capital))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdowns = np.where(peaks > 0, (peaks - eq) / peaks, 0.0)
+        max_drawdown = float(drawdowns.max()) if drawdowns.size else 0.0
+        if eq.size > 1:
+            returns = np.diff(eq) / eq[:-1]
+            # std computed once; the old code called np.std twice (branch + division)
+            sd = returns.std()
+            sharpe_ratio = float(returns.mean() / sd) if sd > 0 else 0.0
         else:
             sharpe_ratio = 0.0
-        final_capital = self.equity_curve[-1] if self.equity_curve else self.initial_capital
+        final_capital = float(eq[-1]) if eq.size else self.initial_capital
         return BacktestResult(
             total_trades=total_trades,
             winning_trades=winning_trades,
@@ -206,27 +259,67 @@ class Backtester:
             timestamps=self.timestamps
         )
 
+    def _run_kernel_loop(self, candles: List[Candle], kernel) -> None:
+        """Run a strategy-provided compiled kernel over the whole series, then
+        rebuild positions and the equity curve from the returned trade indices."""
+        open_, high, low, close, volume, ts_ns = candles_to_arrays(candles)
+        lookback = self.config.lookback_periods
+        entry_idx, exit_idx, reasons = kernel(close, ts_ns, lookback)
+        for k in range(len(entry_idx)):
+            e, x = int(entry_idx[k]), int(exit_idx[k])
+            position = BacktestPosition(
+                id=self.position_id_counter,
+                entry_price=float(close[e]),
+                entry_time=candles[e].timestamp,
+                exit_price=float(close[x]),
+                exit_time=candles[x].timestamp,
+                size=1.0,
+                pnl=float(close[x] - close[e]),
+                exit_reason=reasons[k]
+            )
+            self.position_id_counter += 1
+            self._realized_pnl += position.pnl
+            self.positions.append(position)
+            self.last_exit_time = position.exit_time
+        sizes = np.ones(len(entry_idx), dtype=np.float64)
+        equity = build_equity_curve(close, lookback, self.initial_capital, entry_idx, exit_idx, sizes)
+        self.equity_curve.extend(equity.tolist())
+        self.timestamps.extend(c.timestamp for c in candles[lookback:])
+        if reasons and reasons[-1] == 'End of backtest':
+            self.update_equity_curve(float(close[-1]), candles[-1].timestamp)
+
     def run_backtest(self) -> BacktestResult:
         prisma = Prisma()
         try:
             prisma.connect()
             candles = self.get_historical_data(prisma)
             self.debug.info(f"Running backtest on {len(candles)} candles from {candles[0].timestamp} to {candles[-1].timestamp}")
-            for i in range(self.config.lookback_periods, len(candles)):
+            # Dispatch on the hook, not a strategy name: core stays agnostic
+            # of which strategies have a compiled loop
+            kernel = self.strategy.get_backtest_kernel()
+            if kernel is not None:
+                self._run_kernel_loop(candles, kernel)
+                return self.calculate_metrics()
+            lookback = self.config.lookback_periods
+            self._preallocate_equity_curve(len(candles) - lookback)
+            update_equity_curve = self.update_equity_curve
+            should_sell = self.should_sell
+            should_buy = self.should_buy
+            for i in range(lookback, len(candles)):
                 curr_candle = candles[i]
-                lookback_candles = candles[i - self.config.lookback_periods:i]
-                self.update_equity_curve(curr_candle.close, curr_candle.timestamp)
-                if self.current_position:
-                    sell_signal = self.should_sell(curr_candle)
-                    if sell_signal['shouldSell']:
-                        self.close_position(curr_candle.close, curr_candle.timestamp, sell_signal['reason'])
-                elif not self.current_position:
-                    buy_signal = self.should_buy(lookback_candles, curr_candle)
-                    if buy_signal['action'] == 'buy':
+                update_equity_curve(curr_candle.close, curr_candle.timestamp)
+                if self.current_position is not None:
+                    sell_signal = should_sell(curr_candle, candles[i - lookback:i])
+                    if sell_signal.should_sell:
+                        self.close_position(curr_candle.close, curr_candle.timestamp, sell_signal.reason)
+                else:
+                    buy_signal = should_buy(candles[i - lookback:i], curr_candle)
+                    if buy_signal.action == BUY:
                         self.open_position(curr_candle.close, curr_candle.timestamp)
             if self.current_position:
                 self.close_position(candles[-1].close, candles[-1].timestamp, "End of backtest")
                 self.update_equity_curve(candles[-1].close, candles[-1].timestamp)
+            self._finalize_equity_curve()
             return self.calculate_metrics()
         except Exception as e:
             self.debug.error(f"Error in backtest: {str(e)}")
@@ -239,7 +332,7 @@ class Backtester:
 
     def plot_results(self, result: BacktestResult, candles: List[Candle]) -> None:
         if not candles or not result.timestamps:
-            console.print("[red]No data to plot[/red]")
+            _console().print("[red]No data to plot[/red]")
             return
         
         # Use the core plotter with EMA indicator
@@ -260,12 +353,13 @@ class Backtester:
                 strategy_name=strategy_name,
                 indicators=indicators
             )
-            console.print(f"[green]Backtest plot created: {plot_result}[/green]")
+            _console().print(f"[green]Backtest plot created: {plot_result}[/green]")
         except Exception as e:
-            console.print(f"[red]Error creating backtest plot: {e}[/red]")
+            _console().print(f"[red]Error creating backtest plot: {e}[/red]")
             raise
 
     def display_results(self, result: BacktestResult, show_trade_details: bool = False) -> None:
+        from rich.table import Table
         results_table = Table(
             title=f"{self.config.name} Strategy Backtest Results",
             show_header=True,
@@ -285,7 +379,7 @@ class Backtester:
         results_table.add_row("Initial Capital", f"${result.initial_capital:.2f}")
         results_table.add_row("Final Capital", f"${result.final_capital:.2f}")
         results_table.add_row("Return", f"{((result.final_capital / result.initial_capital) - 1):.2%}")
-        console.print(results_table)
+        _console().print(results_table)
         if show_trade_details and result.positions:
             positions_table = Table(
                 title="Trade Details",
@@ -310,24 +404,30 @@ class Backtester:
                     f"${position.pnl:.2f}" if position.pnl else "-",
                     position.exit_reason or "-"
                 )
-            console.print(positions_table)
+            _console().print(positions_table)
+
+def _run_backtest_worker(args: tuple) -> BacktestResult:
+    strategy_name, token_id = args
+    return Backtester(strategy_name, token_id).run_backtest()
+
+def run_backtest_many(configs: List[tuple], workers: Optional[int] = None) -> List[BacktestResult]:
+    """Run independent (strategy_name, token_id) backtests across a process
+    pool. Each worker opens its own Prisma connection. Results come back in
+    input order."""
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        return list(pool.map(_run_backtest_worker, configs))
 
 def run_backtest(strategy_name: str, token_id: int, show_trade_details: bool = False) -> None:
-    console.print(f"\n[bold cyan]Running {strategy_name.upper()} backtest on token {token_id} using all available data...[/bold cyan]")
+    _console().print(f"\n[bold cyan]Running {strategy_name.upper()} backtest on token {token_id} using all available data...[/bold cyan]")
     backtester = Backtester(strategy_name, token_id)
     try:
         result = backtester.run_backtest()
         backtester.display_results(result, show_trade_details)
-        prisma = Prisma()
-        try:
-            prisma.connect()
-            candles = backtester.get_historical_data(prisma)
-            backtester.plot_results(result, candles)
-        finally:
-            try:
-                prisma.disconnect()
-            except:
-                pass
+        # Candles are cached on the backtester, so no second DB round-trip
+        candles = backtester.get_historical_data(None)
+        backtester.plot_results(result, candles)
     except Exception as e:
-        console.print(f"[red]Backtest failed: {str(e)}[/red]")
+        _console().print(f"[red]Backtest failed: {str(e)}[/red]")
         raise 
\ No newline at end of file
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+"""
+SoA (structure-of-arrays) helpers for compiled backtest fast paths.
+
+Strategies can expose a compiled replay of their own entry/exit rules via
+`TradingStrategy.get_backtest_kernel`; the rules themselves live with their
+strategies. What is strategy-agnostic — converting candles into float64/int64
+arrays for a kernel and rebuilding the equity curve from the trade indices a
+kernel returns — lives here.
+"""
+
+from typing import List, Tuple
+import numpy as np
+import pandas as pd
+
+from core.strategy_interface import Candle
+
+
+def candles_to_arrays(candles: List[Candle]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Convert a list of Candle objects into SoA float64/int64 arrays."""
+    n = len(candles)
+    open_ = np.fromiter((c.open for c in candles), dtype=np.float64, count=n)
+    high = np.fromiter((c.high for c in candles), dtype=np.float64, count=n)
+    low = np.fromiter((c.low for c in candles), dtype=np.float64, count=n)
+    close = np.fromiter((c.close for c in candles), dtype=np.float64, count=n)
+    volume = np.fromiter((c.volume for c in candles), dtype=np.float64, count=n)
+    ts_ns = pd.DatetimeIndex([c.timestamp for c in candles]).as_unit('ns').asi8
+    return open_, high, low, close, volume, ts_ns
+
+
+def build_equity_curve(
+    close: np.ndarray,
+    lookback: int,
+    initial_capital: float,
+    entry_idx: np.ndarray,
+    exit_idx: np.ndarray,
+    sizes: np.ndarray,
+) -> np.ndarray:
+    """Vectorized reconstruction of the per-bar equity curve from trade indices.
+
+    Equity at bar i (evaluated before that bar's trading decisions) is initial
+    capital plus PnL of trades exited before i, plus unrealized PnL of any
+    trade open going into bar i.
+    """
+    bars = np.arange(lookback, close.shape[0])
+    if entry_idx.size == 0:
+        return np.full(bars.shape[0], initial_capital, dtype=np.float64)
+    pnls = (close[exit_idx] - close[entry_idx]) * sizes
+    realized_cum = np.concatenate(([0.0], np.cumsum(pnls)))
+    equity = initial_capital + realized_cum[np.searchsorted(exit_idx, bars, side='left')]
+    # Unrealized PnL: a trade entered at e is open for equity updates on bars (e, x]
+    open_trade = np.searchsorted(entry_idx, bars, side='left') - 1
+    valid = open_trade >= 0
+    open_mask = valid & (bars <= exit_idx[np.where(valid, open_trade, 0)]) & (bars > entry_idx[np.where(valid, open_trade, 0)])
+    entry_prices = close[entry_idx[np.where(valid, open_trade, 0)]]
+    open_sizes = sizes[np.where(valid, open_trade, 0)]
+    equity = equity + np.where(open_mask, (close[bars] - entry_prices) * open_sizes, 0.0)
+    return equity
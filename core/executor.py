@@ -4,32 +4,89 @@ Executor - Abstracted trading bot with strategy pattern
 """
 
 import asyncio
+import json
+import re
 import signal
 import sys
-from datetime import datetime
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Optional
 
 from rich.console import Console
 from rich.prompt import Prompt
 
+import aiohttp
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
 from prisma import Prisma
 from utils.debugger import Debugger
 from utils.solana_wallet import get_wallet_for_telegram_chat
-from lib.jupiter_client import JupiterClient
-from lib.helius_client import HeliusClient
+from lib.jupiter_client import JupiterClient, SwapOptions
+from lib.helius_client import get_shared_helius
+import numpy as np
+
 from core.strategy_factory import StrategyFactory
-from core.strategy_interface import Candle, StrategyConfig
+from core.strategy_interface import Candle, CandleArrays, StrategyConfig
 
 
 # Initialize Rich console
 console = Console()
 
+# Accepts plain decimal numbers; checked before float() so bad input takes a
+# predictable branch instead of an exception unwind
+_NUM_RE = re.compile(r'^-?\d+(?:\.\d+)?$')
+
 # Global signal handler will be set up in main() to avoid conflicts with Executor
 
 
 class Executor:
     """Generic trade executor that works with any strategy"""
     
+    @staticmethod
+    def _trade_configs_path(strategy_name: str) -> Path:
+        return Path.home() / '.maix' / f'trade_configs_{strategy_name.lower()}.json'
+
+    @staticmethod
+    def _valid_trade_configs(trade_configs) -> bool:
+        """Same range constraints the interactive prompts enforce"""
+        try:
+            return (
+                0 < float(trade_configs['balance_percentage']) <= 1
+                and float(trade_configs['default_slippage_bps']) >= 0
+                and float(trade_configs['min_trade_size_sol']) > 0
+                and float(trade_configs['fee_buffer_sol']) >= 0
+            )
+        except (KeyError, TypeError, ValueError):
+            return False
+
+    @classmethod
+    def load_trade_configs(cls, strategy_name: str) -> Optional[dict]:
+        """Load previously confirmed trade configs, or None if absent/invalid"""
+        path = cls._trade_configs_path(strategy_name)
+        try:
+            with open(path, 'r') as f:
+                trade_configs = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return trade_configs if cls._valid_trade_configs(trade_configs) else None
+
+    @classmethod
+    def save_trade_configs(cls, strategy_name: str, trade_configs: dict) -> None:
+        """Persist confirmed trade configs so restarts skip the prompts"""
+        path = cls._trade_configs_path(strategy_name)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(trade_configs, f, indent=2)
+        except OSError as error:
+            console.print(f"⚠️  [yellow]Could not save trade configs to {path}: {error}[/yellow]")
+
     @staticmethod
     def prompt_for_trade_configs(strategy_name: str) -> dict:
         """Prompt user for trade-specific configurations"""
@@ -47,14 +104,15 @@ class Executor:
                     f"\n[bold cyan]Balance percentage[/bold cyan] (default: {config.balance_percentage * 100:.1f}%)",
                     default=str(config.balance_percentage * 100)
                 )
+                if not _NUM_RE.match(balance_input.strip()):
+                    console.print("❌ [red]Invalid input. Please enter a valid number.[/red]")
+                    continue
                 balance_pct = float(balance_input) / 100
                 if 0 < balance_pct <= 1:
                     trade_configs['balance_percentage'] = balance_pct
                     break
                 else:
                     console.print("❌ [red]Balance must be between 0% and 100%[/red]")
-            except ValueError:
-                console.print("❌ [red]Invalid input. Please enter a valid number.[/red]")
             except KeyboardInterrupt:
                 console.print("\n👋 [yellow]Exiting...[/yellow]")
                 sys.exit(0)
@@ -66,14 +124,15 @@ class Executor:
                     f"\n[bold cyan]Slippage tolerance[/bold cyan] (default: {config.default_slippage_bps / 100:.2f}%)",
                     default=str(config.default_slippage_bps / 100)
                 )
+                if not _NUM_RE.match(slippage_input.strip()):
+                    console.print("❌ [red]Invalid input. Please enter a valid number.[/red]")
+                    continue
                 slippage_pct = float(slippage_input)
                 if slippage_pct >= 0:
                     trade_configs['default_slippage_bps'] = slippage_pct * 100
                     break
                 else:
                     console.print("❌ [red]Slippage must be 0% or higher[/red]")
-            except ValueError:
-                console.print("❌ [red]Invalid input. Please enter a valid number.[/red]")
             except KeyboardInterrupt:
                 console.print("\n👋 [yellow]Exiting...[/yellow]")
                 sys.exit(0)
@@ -85,14 +144,15 @@ class Executor:
                     f"\n[bold cyan]Minimum trade size[/bold cyan] (default: {config.min_trade_size_sol} SOL)",
                     default=str(config.min_trade_size_sol)
                 )
+                if not _NUM_RE.match(min_trade_input.strip()):
+                    console.print("❌ [red]Invalid input. Please enter a valid number.[/red]")
+                    continue
                 min_trade = float(min_trade_input)
                 if min_trade > 0:
                     trade_configs['min_trade_size_sol'] = min_trade
                     break
                 else:
                     console.print("❌ [red]Minimum trade size must be greater than 0[/red]")
-            except ValueError:
-                console.print("❌ [red]Invalid input. Please enter a valid number.[/red]")
             except KeyboardInterrupt:
                 console.print("\n👋 [yellow]Exiting...[/yellow]")
                 sys.exit(0)
@@ -104,14 +164,15 @@ class Executor:
                     f"\n[bold cyan]Fee buffer[/bold cyan] (default: {config.fee_buffer_sol} SOL)",
                     default=str(config.fee_buffer_sol)
                 )
+                if not _NUM_RE.match(fee_buffer_input.strip()):
+                    console.print("❌ [red]Invalid input. Please enter a valid number.[/red]")
+                    continue
                 fee_buffer = float(fee_buffer_input)
                 if fee_buffer >= 0:
                     trade_configs['fee_buffer_sol'] = fee_buffer
                     break
                 else:
                     console.print("❌ [red]Fee buffer must be 0 or higher[/red]")
-            except ValueError:
-                console.print("❌ [red]Invalid input. Please enter a valid number.[/red]")
             except KeyboardInterrupt:
                 console.print("\n👋 [yellow]Exiting...[/yellow]")
                 sys.exit(0)
@@ -145,9 +206,21 @@ class Executor:
         self.strategy = StrategyFactory.create_strategy(strategy_name)
         strategy_config = self.strategy.get_config()
         
-        # Prompt for trade configs if requested
+        # Interactive prompts block the process before asyncio.run and re-run
+        # on every supervisor restart, so a confirmed config is cached to disk
+        # and reused; delete the file (or pass trade_configs) to re-prompt
+        prompted = False
         if prompt_for_configs:
-            trade_configs = self.prompt_for_trade_configs(strategy_name)
+            trade_configs = self.load_trade_configs(strategy_name)
+            if trade_configs is not None:
+                console.print(
+                    f"📄 [green]Loaded trade configs from {self._trade_configs_path(strategy_name)}[/green]"
+                    " (delete the file to reconfigure)"
+                )
+            else:
+                trade_configs = self.prompt_for_trade_configs(strategy_name)
+                self.save_trade_configs(strategy_name, trade_configs)
+                prompted = True
         
         # Use custom trade configs if provided, otherwise use strategy defaults
         if trade_configs:
@@ -177,12 +250,15 @@ class Executor:
         # Display final config if prompted for configs
         if prompt_for_configs:
             self.display_final_config()
-            
-            # Confirm before starting
-            from rich.prompt import Confirm
-            if not Confirm.ask("\n🚀 [bold cyan]Start auto-trading with these settings?[/bold cyan]"):
-                console.print("👋 [yellow]Exiting...[/yellow]")
-                sys.exit(0)
+
+            # Confirm before starting, but only on a fresh interactive setup —
+            # a cached config was already confirmed once and must not block
+            # unattended restarts
+            if prompted:
+                from rich.prompt import Confirm
+                if not Confirm.ask("\n🚀 [bold cyan]Start auto-trading with these settings?[/bold cyan]"):
+                    console.print("👋 [yellow]Exiting...[/yellow]")
+                    sys.exit(0)
         self.telegram_chat_id = 'dummy_174546'  # Hardcoded value
         
         # Global state
@@ -190,9 +266,17 @@ class Executor:
         self.is_processing_buy = False
         self.last_exit_time: Optional[datetime] = None
         
-        # Initialize clients
+        self._token_meta_cache = None
+        self._notify_conn = None
+        # Ring buffer of raw OHLCV rows; only rows newer than _max_ts are
+        # fetched after the initial fill
+        self._candle_buf: Optional[deque] = None
+        self._max_ts = None
+
+        # Initialize clients; the shared HeliusClient means the executor and
+        # JupiterClient ride the same HTTP session and RPC pool
         self.jupiter = JupiterClient()
-        self.helius = HeliusClient()
+        self.helius = get_shared_helius()
         self.debug = Debugger.getInstance()
         
         # Register signal handlers for trading loop
@@ -205,40 +289,130 @@ class Executor:
         print("\nShutdown signal received. Exiting gracefully...")
     
     async def get_token_meta(self, prisma: Prisma):
-        """Get token metadata from database"""
-        return prisma.migratedtoken.find_unique(where={'id': self.config.token_id})
+        """Get token metadata from database (memoized; metadata is immutable)"""
+        if self._token_meta_cache is None:
+            self._token_meta_cache = prisma.migratedtoken.find_unique(where={'id': self.config.token_id})
+        return self._token_meta_cache
     
+    async def _start_candle_listener(self):
+        """Subscribe to pg_notify('ohlcv_<tokenId>') so the trading loop wakes
+        exactly when a new candle is inserted (see prisma/ohlcv_notify.sql)
+        instead of sleeping a fixed loop_delay_ms. Returns an asyncio.Queue of
+        notifications, or None when asyncpg or the trigger isn't available —
+        callers then fall back to timed polling."""
+        if asyncpg is None:
+            return None
+        try:
+            from utils.secrets import get_database_url
+            self._notify_conn = await asyncpg.connect(get_database_url())
+            queue: asyncio.Queue = asyncio.Queue()
+
+            def _on_notify(conn, pid, channel, payload):
+                queue.put_nowait(payload)
+
+            await self._notify_conn.add_listener(f'ohlcv_{self.config.token_id}', _on_notify)
+            self.debug.info(f'Listening for ohlcv_{self.config.token_id} notifications')
+            return queue
+        except Exception as error:
+            self.debug.info(f'LISTEN/NOTIFY unavailable, falling back to polling: {error}')
+            return None
+
+    async def _wait_for_next_candle(self, notify_queue) -> None:
+        if notify_queue is not None:
+            try:
+                # Safety pulse: poll anyway if no candle lands within 5s
+                await asyncio.wait_for(notify_queue.get(), timeout=5.0)
+            except asyncio.TimeoutError:
+                pass
+        else:
+            await asyncio.sleep(self.config.loop_delay_ms / 1000)
+
+    @staticmethod
+    def _parse_db_timestamp(value):
+        """query_raw returns timestamps as ISO strings"""
+        if isinstance(value, str):
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return value
+
     async def get_lookback_ohlcv(self, prisma: Prisma):
         """Get lookback OHLCV data from database"""
-        # Fetch lookback+2 candles (for prev, curr, next)
-        ohlcv = prisma.tokenohlcv.find_many(
-            where={'tokenId': self.config.token_id, 'interval': '1s'},
-            order=[{'timestamp': 'desc'}],
-            take=self.config.lookback_periods + 2
-        )
-        
-        if len(ohlcv) < self.config.lookback_periods + 2:
-            return None
-        
-        # Return in ascending order (oldest first)
-        ohlcv.reverse()
-        return [
-            Candle(
-                timestamp=row.timestamp,
-                open=row.open,
-                high=row.high,
-                low=row.low,
-                close=row.close,
-                volume=row.volumeUSD
+        # The window is kept in an in-process ring buffer: the first call
+        # fetches lookback+2 candles (for prev, curr, next), every later call
+        # only pulls rows newer than the buffered maximum. Projection goes
+        # through raw SQL — the Python Prisma client has no select= — so only
+        # the six consumed columns cross the wire.
+        window = self.config.lookback_periods + 2
+        if self._candle_buf is None:
+            # Ascending range scan over the (tokenId, interval, timestamp)
+            # index from a wall-clock cutoff — forward index walk, no Python
+            # reverse. Falls back to the newest rows regardless of age if the
+            # feed is lagging and the cutoff window comes up short.
+            cutoff = datetime.utcnow() - timedelta(seconds=window)
+            # query_raw is synchronous in the Python client; run it on a
+            # worker thread so the loop-top gather genuinely overlaps the
+            # DB read with the Helius requests
+            rows = await asyncio.to_thread(
+                prisma.query_raw,
+                'SELECT "timestamp", "open", "high", "low", "close", "volumeUSD" '
+                'FROM "TokenOHLCV" WHERE "tokenId" = $1 AND "interval" = $2 '
+                'AND "timestamp" >= $3::timestamp ORDER BY "timestamp" ASC LIMIT $4',
+                self.config.token_id,
+                '1s',
+                cutoff.isoformat(),
+                window
+            )
+            if len(rows) < window:
+                rows = await asyncio.to_thread(
+                    prisma.query_raw,
+                    'SELECT "timestamp", "open", "high", "low", "close", "volumeUSD" '
+                    'FROM "TokenOHLCV" WHERE "tokenId" = $1 AND "interval" = $2 '
+                    'ORDER BY "timestamp" DESC LIMIT $3',
+                    self.config.token_id,
+                    '1s',
+                    window
+                )
+                rows.reverse()
+            if len(rows) < window:
+                # Don't store a short buffer: _max_ts would stay unset and
+                # the incremental query below would match nothing forever.
+                # Leaving _candle_buf None retries the full fill next cycle.
+                return None
+            self._candle_buf = deque(rows, maxlen=window)
+        else:
+            new_rows = await asyncio.to_thread(
+                prisma.query_raw,
+                'SELECT "timestamp", "open", "high", "low", "close", "volumeUSD" '
+                'FROM "TokenOHLCV" WHERE "tokenId" = $1 AND "interval" = $2 '
+                'AND "timestamp" > $3::timestamp ORDER BY "timestamp" ASC',
+                self.config.token_id,
+                '1s',
+                self._max_ts
             )
-            for row in ohlcv
-        ]
+            self._candle_buf.extend(new_rows)
+
+        # The buffer is only ever stored full (maxlen=window), so _max_ts
+        # advances on every call that reaches here
+        self._max_ts = self._candle_buf[-1]['timestamp']
+
+        # Return in ascending order (oldest first), as SoA arrays so the
+        # per-second polling loop doesn't allocate N Candle objects
+        rows = list(self._candle_buf)
+        n = len(rows)
+        return CandleArrays(
+            timestamps=[self._parse_db_timestamp(row['timestamp']) for row in rows],
+            opens=np.fromiter((row['open'] for row in rows), dtype=np.float64, count=n),
+            highs=np.fromiter((row['high'] for row in rows), dtype=np.float64, count=n),
+            lows=np.fromiter((row['low'] for row in rows), dtype=np.float64, count=n),
+            closes=np.fromiter((row['close'] for row in rows), dtype=np.float64, count=n),
+            volumes=np.fromiter((row['volumeUSD'] for row in rows), dtype=np.float64, count=n),
+        )
     
-    async def calculate_trade_size(self, wallet_public_key: str) -> float:
+    async def calculate_trade_size(self, wallet_public_key: str, balance_sol: Optional[float] = None) -> float:
         """Calculate trade size based on wallet balance"""
-        balance_lamports = await self.helius.get_sol_balance(wallet_public_key)
-        balance_sol = balance_lamports / 1e9  # Convert lamports to SOL
-        
+        if balance_sol is None:
+            balance_lamports = await self.helius.get_sol_balance(wallet_public_key)
+            balance_sol = balance_lamports / 1e9  # Convert lamports to SOL
+
         # Calculate available balance after reserving for fees and rent
         reserved_for_fees = self.config.fee_buffer_sol + self.config.rent_buffer_sol
         available_balance = max(0, balance_sol - reserved_for_fees)
@@ -254,62 +428,77 @@ class Executor:
         
         return trade_size
     
+    # Jupiter's slippageBps is a cap, not a target: the swap still fills at
+    # the quoted route price, the cap only decides when it aborts. The old
+    # retry ladder (5% -> 10% -> 20% -> 50%, 0.5s sleeps between) paid up to
+    # 4 round trips to reach its widest bound, but widening the user's
+    # configured tolerance to a blanket 50% minOut is exactly the adverse-
+    # movement window sandwich bots exploit. Instead the quote keeps the
+    # configured tolerance and the /swap call enables Jupiter's server-side
+    # dynamic slippage, which sets minOut from the estimate at swap time,
+    # never wider than MAX_SLIPPAGE_BPS.
+    MAX_SLIPPAGE_BPS = 5000  # 50% ceiling on the server-side estimate
+    _SWAP_OPTIONS = SwapOptions(
+        use_dynamic_slippage=True,
+        dynamic_slippage_max_bps=MAX_SLIPPAGE_BPS
+    )
+
     async def execute_buy(self, wallet, token_mint: str, trade_size: float):
-        """Execute buy transaction with retry logic"""
-        slippage_levels = [self.config.default_slippage_bps, 1000, 2000, 5000]  # 5%, 10%, 20%, 50%
-        last_error = None
-        
-        for slippage_bps in slippage_levels:
-            try:
-                self.debug.info(f'Attempting buy with {slippage_bps / 100}% slippage...')
-                buy_result = await self.jupiter.buy_token(
-                    {'publicKey': wallet.publicKey, 'secretKey': wallet.secretKey},
-                    token_mint,
-                    trade_size,
-                    slippage_bps
-                )
-                self.debug.info(f'Buy successful with {slippage_bps / 100}% slippage')
-                return buy_result
-            except Exception as error:
-                last_error = error
-                self.debug.info(f'Buy failed with {slippage_bps / 100}% slippage: {str(error)}')
-                if slippage_bps == slippage_levels[-1]:
-                    raise last_error
-                await asyncio.sleep(0.5)
-        
-        raise ValueError('Buy transaction failed after all retry attempts')
-    
+        """Execute buy transaction with server-side dynamic slippage"""
+        slippage_bps = self.config.default_slippage_bps
+        try:
+            self.debug.info(f'Attempting buy with {slippage_bps / 100}% slippage (dynamic at swap time)...')
+            buy_result = await self.jupiter.buy_token(
+                {'publicKey': wallet.publicKey, 'secretKey': wallet.secretKey},
+                token_mint,
+                trade_size,
+                slippage_bps,
+                self._SWAP_OPTIONS
+            )
+            self.debug.info('Buy successful')
+            return buy_result
+        except Exception as error:
+            self.debug.info(f'Buy failed with {slippage_bps / 100}% slippage: {str(error)}')
+            raise
+
     async def execute_sell(self, wallet, token_mint: str, token_balance: float):
-        """Execute sell transaction with retry logic"""
-        slippage_levels = [self.config.default_slippage_bps, 1000, 2000, 5000]  # 5%, 10%, 20%, 50%
-        last_error = None
-        
-        for slippage_bps in slippage_levels:
-            try:
-                self.debug.info(f'Attempting sell with {slippage_bps / 100}% slippage...')
-                signature = await self.jupiter.sell_token(
-                    {'publicKey': wallet.publicKey, 'secretKey': wallet.secretKey},
-                    token_mint,
-                    token_balance,
-                    slippage_bps
-                )
-                self.debug.info(f'Sell successful with {slippage_bps / 100}% slippage')
-                return signature
-            except Exception as error:
-                last_error = error
-                self.debug.info(f'Sell failed with {slippage_bps / 100}% slippage: {str(error)}')
-                if slippage_bps == slippage_levels[-1]:
-                    raise last_error
-                await asyncio.sleep(0.5)
-        
-        raise ValueError('Sell transaction failed after all retry attempts')
+        """Execute sell transaction with server-side dynamic slippage"""
+        slippage_bps = self.config.default_slippage_bps
+        try:
+            self.debug.info(f'Attempting sell with {slippage_bps / 100}% slippage (dynamic at swap time)...')
+            signature = await self.jupiter.sell_token(
+                {'publicKey': wallet.publicKey, 'secretKey': wallet.secretKey},
+                token_mint,
+                token_balance,
+                slippage_bps,
+                self._SWAP_OPTIONS
+            )
+            self.debug.info('Sell successful')
+            return signature
+        except Exception as error:
+            self.debug.info(f'Sell failed with {slippage_bps / 100}% slippage: {str(error)}')
+            raise
     
     async def run(self):
         """Main trading loop"""
         # Initialize Prisma client
         prisma = Prisma()
         await prisma.connect()
-        
+
+        # One keep-alive HTTP session for Jupiter and Helius, so every poll
+        # reuses warm connections instead of paying TLS + DNS per request
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=60),
+            headers={
+                "Content-Type": "application/json",
+                "Accept-Encoding": "gzip, deflate",
+                "User-Agent": "maix-strategy/1.0"
+            },
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+        self.jupiter.use_session(http_session)
+        self.helius.use_session(http_session)
+
         try:
             # Get wallet
             wallet = get_wallet_for_telegram_chat(prisma, self.telegram_chat_id)
@@ -333,33 +522,61 @@ class Executor:
                 'LOOKBACK': self.config.lookback_periods,
                 'BALANCE_PERCENTAGE': f'{self.config.balance_percentage * 100:.1f}%'
             })
-            
+
+            notify_queue = await self._start_candle_listener()
+
+            # Hoist per-iteration attribute chains to locals once —
+            # LOAD_FAST instead of repeated LOAD_ATTR every poll
+            find_first = prisma.position.find_first
+            position_where = {
+                'walletId': wallet.id,
+                'tokenAddress': token_mint,
+                'status': 'OPEN'
+            }
+            get_lookback = self.get_lookback_ohlcv
+            get_sol_balance = self.helius.get_sol_balance
+            should_buy = self.strategy.should_buy
+            should_sell = self.strategy.should_sell
+            create_position = self.strategy.create_position
+            debug_info = self.debug.info
+            debug_error = self.debug.error
+            wait_for_next_candle = self._wait_for_next_candle
+            strategy_name = self.config.name
+            lookback_periods = self.config.lookback_periods
+            balance_percentage = self.config.balance_percentage
+            fee_buffer_sol = self.config.fee_buffer_sol
+            rent_buffer_sol = self.config.rent_buffer_sol
+            min_trade_size_sol = self.config.min_trade_size_sol
+
             while not self.should_exit:
                 try:
-                    # 1. Load open position
-                    existing_position = prisma.position.find_first(
-                        where={
-                            'walletId': wallet.id,
-                            'tokenAddress': token_mint,
-                            'status': 'OPEN'
-                        }
+                    # 1+2. Load open position, lookback OHLCV and SOL balance
+                    # concurrently — the three reads are independent, so the
+                    # iteration waits max(DB, Helius) instead of their sum
+                    # (prisma.batch_ only supports writes in the Python client)
+                    existing_position, candles, balance_lamports = await asyncio.gather(
+                        asyncio.to_thread(find_first, where=position_where),
+                        get_lookback(prisma),
+                        get_sol_balance(wallet.publicKey)
                     )
-                    
-                    # 2. Get lookback window of OHLCV candles
-                    candles = await self.get_lookback_ohlcv(prisma)
                     if not candles:
-                        self.debug.error('Not enough OHLCV data')
-                        await asyncio.sleep(self.config.loop_delay_ms / 1000)
+                        debug_error('Not enough OHLCV data')
+                        await wait_for_next_candle(notify_queue)
                         continue
                     
-                    lookback_candles = candles[:self.config.lookback_periods]
-                    curr_candle = candles[self.config.lookback_periods + 1]
-                    
+                    lookback_candles = candles[:lookback_periods]
+                    curr_candle = candles[lookback_periods + 1]
+
+                    # One clock read per tick; strategies consume data['now']
+                    # instead of each taking their own syscall
+                    now_utc = datetime.now(timezone.utc)
+
                     # 3. Use strategy to decide
-                    signal_data = self.strategy.should_buy({
+                    signal_data = should_buy({
                         'lookback': lookback_candles,
                         'curr': curr_candle,
-                        'last_exit_time': self.last_exit_time
+                        'last_exit_time': self.last_exit_time,
+                        'now': now_utc
                     })
                     
                     # Visual indicator for hold signals
@@ -372,47 +589,45 @@ class Executor:
                     if not existing_position and signal_data['action'] == 'buy' and not self.is_processing_buy:
                         self.is_processing_buy = True
                         
-                        self.debug.info(f'{self.config.name} buy signal detected:', signal_data['info'])
+                        debug_info(f'{strategy_name} buy signal detected:', signal_data['info'])
                         
                         try:
-                            # Get current balance for logging
-                            balance_lamports = await self.helius.get_sol_balance(wallet.publicKey)
+                            # Balance was fetched with the loop-top gather
                             balance_sol = balance_lamports / 1e9
-                            
+
                             # Check if we have minimum balance for any trade
-                            min_required_balance = self.config.fee_buffer_sol + self.config.rent_buffer_sol + self.config.min_trade_size_sol
+                            min_required_balance = fee_buffer_sol + rent_buffer_sol + min_trade_size_sol
                             if balance_sol < min_required_balance:
-                                self.debug.info('Insufficient balance for any trade:', {
+                                debug_info('Insufficient balance for any trade:', {
                                     'balance': f'{balance_sol:.4f}',
                                     'minRequired': f'{min_required_balance:.4f}'
                                 })
                                 continue
                             
-                            trade_size = await self.calculate_trade_size(wallet.publicKey)
-                            self.debug.info(f'{self.config.name} trade size calculated:', {
+                            trade_size = await self.calculate_trade_size(wallet.publicKey, balance_sol)
+                            debug_info(f'{strategy_name} trade size calculated:', {
                                 'totalBalance': f'{balance_sol:.4f}',
-                                'reservedForFees': f'{self.config.fee_buffer_sol + self.config.rent_buffer_sol:.4f}',
-                                'availableBalance': f'{balance_sol - self.config.fee_buffer_sol - self.config.rent_buffer_sol:.4f}',
+                                'reservedForFees': f'{fee_buffer_sol + rent_buffer_sol:.4f}',
+                                'availableBalance': f'{balance_sol - fee_buffer_sol - rent_buffer_sol:.4f}',
                                 'tradeSize': f'{trade_size:.4f}',
-                                'balancePercentage': f'{self.config.balance_percentage * 100:.1f}%'
+                                'balancePercentage': f'{balance_percentage * 100:.1f}%'
                             })
                             
                             # Double-check we have enough balance for the trade + fees
-                            total_required = trade_size + self.config.fee_buffer_sol + self.config.rent_buffer_sol
+                            total_required = trade_size + fee_buffer_sol + rent_buffer_sol
                             if balance_sol < total_required:
                                 raise ValueError(
                                     f"Insufficient balance for trade. Required: {total_required:.4f} SOL, Available: {balance_sol:.4f} SOL"
                                 )
                             
-                            start_time = datetime.now()
-                            self.debug.info(f'Sending {self.config.name} buy transaction...')
-                            
+                            start_ns = time.perf_counter_ns()
+                            debug_info(f'Sending {strategy_name} buy transaction...')
+
                             buy_result = await self.execute_buy(wallet, token_mint, trade_size)
+
+                            time_taken = (time.perf_counter_ns() - start_ns) / 1e6
                             
-                            end_time = datetime.now()
-                            time_taken = (end_time - start_time).total_seconds() * 1000
-                            
-                            self.debug.info(f'{self.config.name} buy transaction confirmed:', {
+                            debug_info(f'{strategy_name} buy transaction confirmed:', {
                                 'signature': buy_result['signature'],
                                 'tradeSize': f'{trade_size:.4f}',
                                 'outputAmount': buy_result['outputAmount'],
@@ -433,28 +648,32 @@ class Executor:
                                 'txOpen': buy_result['signature']
                             })
                             
-                            self.debug.info(f'{self.config.name} position recorded in database with SOL value:', trade_size)
+                            debug_info(f'{strategy_name} position recorded in database with SOL value:', trade_size)
                             
                         except Exception as error:
-                            self.debug.error(f'Error placing {self.config.name} buy order:', str(error))
+                            debug_error(f'Error placing {strategy_name} buy order:', str(error))
                         finally:
                             self.is_processing_buy = False
                     
                     # --- SELL LOGIC ---
                     elif existing_position:
                         # Create position object with proper structure
-                        position = self.strategy.create_position(
+                        position = create_position(
                             existing_position.id,
                             existing_position.entryPrice,
                             existing_position.entryTime,
                             existing_position.size
                         )
                         
-                        sell_signal = self.strategy.should_sell({
+                        sell_signal = should_sell({
                             'position': position,
                             'curr': curr_candle,
                             'entry_price': existing_position.entryPrice,
-                            'entry_time': existing_position.entryTime
+                            'entry_time': existing_position.entryTime,
+                            # Indicator-based exits (EMA gradient, local
+                            # maxima) need the window, not just the bar
+                            'lookback': lookback_candles,
+                            'now': now_utc
                         })
                         
                         if sell_signal['shouldSell']:
@@ -468,25 +687,24 @@ class Executor:
                                 actual_token_balance = token_balance['amount'] if token_balance else 0
                                 
                                 if actual_token_balance <= 0:
-                                    self.debug.error(f'No {self.config.name} tokens to sell. Actual balance:', actual_token_balance)
+                                    debug_error(f'No {strategy_name} tokens to sell. Actual balance:', actual_token_balance)
                                     continue
                                 
-                                self.debug.info(f'Selling {self.config.name} tokens:', {
+                                debug_info(f'Selling {strategy_name} tokens:', {
                                     'storedPositionSize': existing_position.size,
                                     'actualTokenBalance': actual_token_balance,
                                     'sellReason': sell_signal['reason'],
                                     'sellInfo': sell_signal['info']
                                 })
                                 
-                                start_time = datetime.now()
-                                self.debug.info(f'Sending {self.config.name} sell transaction...')
-                                
+                                start_ns = time.perf_counter_ns()
+                                debug_info(f'Sending {strategy_name} sell transaction...')
+
                                 signature = await self.execute_sell(wallet, token_mint, actual_token_balance)
+
+                                time_taken = (time.perf_counter_ns() - start_ns) / 1e6
                                 
-                                end_time = datetime.now()
-                                time_taken = (end_time - start_time).total_seconds() * 1000
-                                
-                                self.debug.info(f'{self.config.name} sell transaction confirmed:', {
+                                debug_info(f'{strategy_name} sell transaction confirmed:', {
                                     'signature': signature,
                                     'size': actual_token_balance,
                                     'timeTakenMs': time_taken,
@@ -509,7 +727,7 @@ class Executor:
                                 # Update last exit time for cooldown
                                 self.last_exit_time = datetime.now()
                                 
-                                self.debug.info(f'[{self.config.name.upper()} EXIT]', {
+                                debug_info(f'[{strategy_name.upper()} EXIT]', {
                                     'signature': signature,
                                     'price': curr_candle.close,
                                     'time': curr_candle.timestamp,
@@ -519,14 +737,20 @@ class Executor:
                                 })
                                 
                             except Exception as error:
-                                self.debug.error(f'Error placing {self.config.name} sell order:', str(error))
+                                debug_error(f'Error placing {strategy_name} sell order:', str(error))
                 
                 except Exception as err:
-                    self.debug.error(f'Error in {self.config.name} trading loop:', str(err))
-                
-                await asyncio.sleep(self.config.loop_delay_ms / 1000)
+                    debug_error(f'Error in {strategy_name} trading loop:', str(err))
+
+                await wait_for_next_candle(notify_queue)
             
-            self.debug.info(f'{self.config.name} trading loop exited.')
+            debug_info(f'{strategy_name} trading loop exited.')
         
         finally:
-            await prisma.disconnect() 
\ No newline at end of file
+            if self._notify_conn is not None:
+                try:
+                    await self._notify_conn.close()
+                except Exception:
+                    pass
+            await http_session.close()
+            await prisma.disconnect()
\ No newline at end of file
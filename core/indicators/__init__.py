@@ -1,5 +1,5 @@
 # Indicators module for trading strategies
 from .pivot_points import calculate_pivot_points
-from .ema import calculate_ema
+from .ema import calculate_ema, IncrementalEMA
 
-__all__ = ['calculate_pivot_points', 'calculate_ema'] 
\ No newline at end of file
+__all__ = ['calculate_pivot_points', 'calculate_ema', 'IncrementalEMA']
\ No newline at end of file
@@ -1,32 +1,87 @@
-from typing import List, Tuple
-from core.strategy_interface import Candle
+from typing import List, Tuple, Union
+import numpy as np
+from core.strategy_interface import Candle, CandleArrays
+from core.kernels import ema_series
 
-def calculate_ema(candles: List[Candle], period: int = 20) -> List[Tuple[int, float]]:
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None
+
+def calculate_ema(candles: Union[List[Candle], CandleArrays], period: int = 20) -> List[Tuple[int, float]]:
     """
     Calculate Exponential Moving Average (EMA) for given candles.
-    
+
     Args:
-        candles: List of Candle objects
+        candles: List of Candle objects or a CandleArrays window
         period: EMA period (default: 20)
-    
+
     Returns:
         List of tuples (timestamp, ema_value)
     """
     if len(candles) < period:
         return []
-    
-    ema_values = []
+
     multiplier = 2 / (period + 1)
-    
-    # Calculate SMA for the first period values
-    sma = sum(c.close for c in candles[:period]) / period
-    ema_values.append((candles[period-1].timestamp, sma))
-    
-    # Calculate EMA for remaining values
-    for i in range(period, len(candles)):
-        current_close = candles[i].close
-        prev_ema = ema_values[-1][1]
-        ema = (current_close * multiplier) + (prev_ema * (1 - multiplier))
-        ema_values.append((candles[i].timestamp, ema))
-    
-    return ema_values 
\ No newline at end of file
+    if isinstance(candles, CandleArrays):
+        closes = candles.closes
+        timestamps = candles.timestamps
+    else:
+        closes = np.fromiter((c.close for c in candles), dtype=np.float64, count=len(candles))
+        timestamps = [c.timestamp for c in candles]
+
+    # Seed with the SMA of the first period values
+    sma = closes[:period].mean()
+
+    if lfilter is not None:
+        # The EMA recursion y[i] = m*x[i] + (1-m)*y[i-1] is an IIR filter;
+        # lfilter runs it in C instead of a Python per-candle loop
+        ema_tail, _ = lfilter(
+            [multiplier], [1.0, -(1.0 - multiplier)],
+            closes[period:],
+            zi=np.array([(1.0 - multiplier) * sma])
+        )
+        values = [sma] + ema_tail.tolist()
+    else:
+        # core.kernels.ema_series is numba-compiled when available, so the
+        # no-scipy path still avoids a per-candle Python loop
+        values = ema_series(np.ascontiguousarray(closes), period).tolist()
+
+    return list(zip(timestamps[period - 1:], values))
+
+
+class IncrementalEMA:
+    """
+    Stateful EMA that advances one multiply-add per new candle.
+
+    `calculate_ema` redoes every recursion from the SMA seed on each call; in
+    a per-second polling loop only the newest candle is actually new, so a
+    live caller can seed once and then pay O(1) per tick. Re-submitting a
+    candle with the same timestamp (the still-forming bar) recomputes it from
+    the prior state instead of compounding it twice.
+    """
+    __slots__ = ('period', 'multiplier', 'last_ts', 'last_ema', 'prev_ema')
+
+    def __init__(self, period: int = 20):
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.last_ts = None
+        self.last_ema: float = 0.0
+        self.prev_ema: float = 0.0
+
+    def seed(self, candles: Union[List[Candle], CandleArrays]) -> None:
+        """Bootstrap from a full window via `calculate_ema`."""
+        ema_values = calculate_ema(candles, self.period)
+        if len(ema_values) < 2:
+            self.last_ts = None
+            return
+        self.prev_ema = ema_values[-2][1]
+        self.last_ts, self.last_ema = ema_values[-1][0], ema_values[-1][1]
+
+    def update(self, candle: Candle) -> float:
+        """Advance (or re-update, if the timestamp repeats) by one candle."""
+        if candle.timestamp != self.last_ts:
+            self.prev_ema = self.last_ema
+            self.last_ts = candle.timestamp
+        self.last_ema = candle.close * self.multiplier + self.prev_ema * (1 - self.multiplier)
+        return self.last_ema
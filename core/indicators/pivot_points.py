@@ -1,57 +1,113 @@
 from datetime import datetime
-from typing import List, Tuple
-from core.strategy_interface import Candle
+from typing import List, Tuple, Union
+import numpy as np
+from core.strategy_interface import Candle, CandleArrays
+from core.kernels import njit
 
-def calculate_pivot_points(candles: List[Candle], window: int = 5) -> Tuple[List[Tuple[datetime, float]], List[Tuple[datetime, float]]]:
+@njit(cache=True)
+def _pivot_kernel(highs: np.ndarray, lows: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Boolean masks of pivot highs/lows, compiled with numba when available.
+
+    Rolling extremes over the `window` bars on each side are maintained with
+    monotonic index deques (preallocated arrays here, so the loop stays in
+    nopython mode), keeping the scan O(N). A bar is a pivot high iff it is
+    strictly above the max of its left and right neighborhoods; pivot lows
+    are symmetric.
+    """
+    n = highs.shape[0]
+    is_high = np.zeros(n, dtype=np.bool_)
+    is_low = np.zeros(n, dtype=np.bool_)
+    if n <= 2 * window:
+        return is_high, is_low
+
+    left_max = np.empty(n, dtype=np.float64)
+    left_min = np.empty(n, dtype=np.float64)
+    right_max = np.empty(n, dtype=np.float64)
+    right_min = np.empty(n, dtype=np.float64)
+
+    dq = np.empty(n, dtype=np.int64)
+    # Trailing max/min of the `window` values ending at each index
+    head, tail = 0, 0
+    for j in range(n):
+        while tail > head and highs[j] >= highs[dq[tail - 1]]:
+            tail -= 1
+        dq[tail] = j
+        tail += 1
+        if dq[head] <= j - window:
+            head += 1
+        left_max[j] = highs[dq[head]]
+    head, tail = 0, 0
+    for j in range(n):
+        while tail > head and lows[j] <= lows[dq[tail - 1]]:
+            tail -= 1
+        dq[tail] = j
+        tail += 1
+        if dq[head] <= j - window:
+            head += 1
+        left_min[j] = lows[dq[head]]
+    # Same passes right-to-left give the extremes of the bars ahead
+    head, tail = 0, 0
+    for j in range(n - 1, -1, -1):
+        while tail > head and highs[j] >= highs[dq[tail - 1]]:
+            tail -= 1
+        dq[tail] = j
+        tail += 1
+        if dq[head] >= j + window:
+            head += 1
+        right_max[j] = highs[dq[head]]
+    head, tail = 0, 0
+    for j in range(n - 1, -1, -1):
+        while tail > head and lows[j] <= lows[dq[tail - 1]]:
+            tail -= 1
+        dq[tail] = j
+        tail += 1
+        if dq[head] >= j + window:
+            head += 1
+        right_min[j] = lows[dq[head]]
+
+    for i in range(window, n - window):
+        if highs[i] > left_max[i - 1] and highs[i] > right_max[i + 1]:
+            is_high[i] = True
+        if lows[i] < left_min[i - 1] and lows[i] < right_min[i + 1]:
+            is_low[i] = True
+    return is_high, is_low
+
+def calculate_pivot_points(candles: Union[List[Candle], CandleArrays], window: int = 5) -> Tuple[List[Tuple[datetime, float]], List[Tuple[datetime, float]]]:
     """
     Calculate pivot points from candle data.
-    
+
+    A pivot high (resistance) is a bar strictly above every other high within
+    `window` bars on each side; pivot lows (support) are symmetric. The scan
+    runs in a float64-array kernel that numba JIT-compiles when installed.
+
     Args:
         candles: List of Candle objects
         window: Window size for finding pivots (default: 5)
-    
+
     Returns:
         Tuple of (pivot_low, pivot_high) where each point is (timestamp, price)
     """
-    highs = [c.high for c in candles]
-    lows = [c.low for c in candles]
-    closes = [c.close for c in candles]
-    
-    pivots = []
-    
-    for i in range(window, len(closes) - window):
-        # Pivot High (resistance)
-        is_pivot_high = True
-        for j in range(i - window, i + window + 1):
-            if j != i and highs[j] >= highs[i]:
-                is_pivot_high = False
-                break
-        
-        if is_pivot_high:
-            pivots.append(('resistance', i, highs[i]))
-        
-        # Pivot Low (support)
-        is_pivot_low = True
-        for j in range(i - window, i + window + 1):
-            if j != i and lows[j] <= lows[i]:
-                is_pivot_low = False
-                break
-        
-        if is_pivot_low:
-            pivots.append(('support', i, lows[i]))
-    
-    # Separate into support (pivot_low) and resistance (pivot_high) points
+    n = len(candles)
+    if isinstance(candles, CandleArrays):
+        highs = candles.highs
+        lows = candles.lows
+        timestamps = candles.timestamps
+    else:
+        highs = np.fromiter((c.high for c in candles), dtype=np.float64, count=n)
+        lows = np.fromiter((c.low for c in candles), dtype=np.float64, count=n)
+        timestamps = [c.timestamp for c in candles]
+
     support_points = []
     resistance_points = []
-    
-    for pivot_type, index, price in pivots:
-        if pivot_type == 'support':
-            support_points.append((candles[index].timestamp, price))
-        else:  # resistance
-            resistance_points.append((candles[index].timestamp, price))
-    
-    # Sort by timestamp
-    support_points.sort(key=lambda x: x[0])
-    resistance_points.sort(key=lambda x: x[0])
-    
-    return support_points, resistance_points 
\ No newline at end of file
+
+    # flatnonzero yields ascending indices and timestamps are monotonic in
+    # index, so the points come out timestamp-sorted already
+    if n > 2 * window:
+        is_high, is_low = _pivot_kernel(np.ascontiguousarray(highs), np.ascontiguousarray(lows), window)
+        for i in np.flatnonzero(is_high):
+            resistance_points.append((timestamps[i], float(highs[i])))
+        for i in np.flatnonzero(is_low):
+            support_points.append((timestamps[i], float(lows[i])))
+
+    return support_points, resistance_points
@@ -0,0 +1,69 @@
+"""
+Numba-compiled hot kernels shared by strategies and backtests.
+
+Live ticks barely notice these, but backtests replay thousands of candles
+through the EMA recurrence and extrema checks; compiling them keeps those
+runs out of the Python interpreter. Without numba everything still runs as
+ordinary Python over NumPy arrays.
+"""
+import numpy as np
+
+# Single home for the numba fallback; other modules import njit/HAS_NUMBA
+# from here instead of repeating the shim
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op decorator so kernels run as plain Python without numba."""
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True, fastmath=True)
+def ema_series(closes: np.ndarray, period: int) -> np.ndarray:
+    """EMA values from index period-1 onward, seeded with the first SMA."""
+    n = closes.shape[0]
+    m = 2.0 / (period + 1.0)
+    out = np.empty(n - period + 1, dtype=np.float64)
+    sma = 0.0
+    for i in range(period):
+        sma += closes[i]
+    sma /= period
+    out[0] = sma
+    ema = sma
+    for i in range(period, n):
+        ema = closes[i] * m + ema * (1.0 - m)
+        out[i - period + 1] = ema
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def is_local_min_last(closes: np.ndarray, min_change: float) -> bool:
+    """True when the newest close extends two consecutive declines by at
+    least `min_change` (fractional) — the live-edge local-minimum test."""
+    n = closes.shape[0]
+    if n < 3:
+        return False
+    return (
+        closes[n - 1] <= closes[n - 2] < closes[n - 3]
+        and (closes[n - 2] - closes[n - 1]) / closes[n - 2] >= min_change
+    )
+
+
+@njit(cache=True, fastmath=True)
+def is_local_max_last(closes: np.ndarray, min_change: float) -> bool:
+    """Mirror of is_local_min_last for the live-edge local-maximum test."""
+    n = closes.shape[0]
+    if n < 3:
+        return False
+    return (
+        closes[n - 1] >= closes[n - 2] > closes[n - 3]
+        and (closes[n - 1] - closes[n - 2]) / closes[n - 2] >= min_change
+    )
@@ -1,48 +1,95 @@
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Optional
-from core.strategy_interface import Candle
+from typing import List, Dict, Any, Optional, Union
+from core.strategy_interface import Candle, CandleArrays
 from core.indicators import calculate_pivot_points, calculate_ema
 from rich.console import Console
 
 console = Console()
 
+def _m4_aggregate(df: pd.DataFrame, n_out: int) -> pd.DataFrame:
+    """
+    Downsample an OHLCV frame to ~n_out rows with M4 bucketing.
+
+    Each bucket keeps first Open, max High, min Low and last Close (so candle
+    semantics survive) and sums Volume; the bucket is stamped with its first
+    timestamp. Renders in constant time regardless of input length.
+    """
+    buckets = np.arange(len(df)) * n_out // len(df)
+    agg = df.groupby(buckets).agg({
+        'Open': 'first',
+        'High': 'max',
+        'Low': 'min',
+        'Close': 'last',
+        'Volume': 'sum'
+    })
+    first_pos = np.unique(buckets, return_index=True)[1]
+    agg.index = df.index[first_pos]
+    return agg
+
 def plot_trading_signals(
-    candles: List[Candle], 
-    token_title: str,
-    strategy_name: str,
-    indicators: Optional[Dict[str, Dict[str, Any]]] = None
+    candles: Union[List[Candle], CandleArrays],
+    token_title: Optional[str] = None,
+    strategy_name: str = "",
+    indicators: Optional[Dict[str, Dict[str, Any]]] = None,
+    max_points: int = 2000,
+    buy_points: Optional[List[tuple]] = None,
+    sell_points: Optional[List[tuple]] = None,
+    token_id: Optional[int] = None
 ) -> str:
     """
     Plot trading signals with optional indicators.
-    
+
     Args:
         candles: List of Candle objects
-        token_title: Title for the token
+        token_title: Title for the token (falls back to token_id)
         strategy_name: Name of the strategy
         indicators: Dictionary of indicators to plot with their parameters
                    Example: {"pivot_points": {"window": 5}}
+        max_points: Downsample to roughly this many bars before rendering
+                   (M4 aggregation); large candle sets stall the browser
+        buy_points: Optional (timestamp, price) buy markers
+        sell_points: Optional (timestamp, price) sell markers
+        token_id: Used for the title when token_title is not given
     """
+    # Plotly is one of the heaviest import graphs in the stack; defer it so
+    # CLI paths that never plot don't pay the module-load tax
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    if token_title is None:
+        token_title = f"Token {token_id}" if token_id is not None else ""
     if not candles:
         console.print("[red]No candle data to plot[/red]")
         return ""
     
     try:
-        # Create DataFrame from candles
-        df = pd.DataFrame([
-            {
-                'timestamp': c.timestamp,
-                'Open': c.open,
-                'High': c.high,
-                'Low': c.low,
-                'Close': c.close,
-                'Volume': c.volume
+        # Build the DataFrame column-wise from float64 arrays — the per-row
+        # list-of-dicts path pays dict hashing and type inference per candle
+        n = len(candles)
+        if isinstance(candles, CandleArrays):
+            columns = {
+                'Open': candles.opens,
+                'High': candles.highs,
+                'Low': candles.lows,
+                'Close': candles.closes,
+                'Volume': candles.volumes
             }
-            for c in candles
-        ])
-        df.set_index('timestamp', inplace=True)
-        
+            index = pd.DatetimeIndex(candles.timestamps, name='timestamp')
+        else:
+            columns = {
+                'Open': np.fromiter((c.open for c in candles), dtype=np.float64, count=n),
+                'High': np.fromiter((c.high for c in candles), dtype=np.float64, count=n),
+                'Low': np.fromiter((c.low for c in candles), dtype=np.float64, count=n),
+                'Close': np.fromiter((c.close for c in candles), dtype=np.float64, count=n),
+                'Volume': np.fromiter((c.volume for c in candles), dtype=np.float64, count=n)
+            }
+            index = pd.DatetimeIndex([c.timestamp for c in candles], name='timestamp')
+        df = pd.DataFrame(columns, index=index)
+
+        if max_points and n > max_points:
+            df = _m4_aggregate(df, max_points)
+
         # Create subplots
         fig = make_subplots(
             rows=2, cols=1,
@@ -67,10 +114,10 @@ def plot_trading_signals(
             row=1, col=1
         )
         
-        # Add volume bars with better visibility
-        colors = ['#26A69A' if close >= open else '#EF5350' 
-                 for close, open in zip(df['Close'], df['Open'])]
-        
+        # Add volume bars with better visibility; one C-level compare/select
+        # instead of a per-row Python conditional
+        colors = np.where(df['Close'].to_numpy() >= df['Open'].to_numpy(), '#26A69A', '#EF5350')
+
         fig.add_trace(
             go.Bar(
                 x=df.index,
@@ -149,6 +196,30 @@ def plot_trading_signals(
                             row=1, col=1
                         )
         
+        # Signal markers, snapped onto plotted bars via a sorted-array search
+        # (no per-point Timestamp boxing or dict building); snapping keeps
+        # markers on real bars even after M4 downsampling
+        idx_ns = df.index.as_unit('ns').asi8
+        for points, label, symbol, color in (
+            (buy_points, 'Buy', 'triangle-up', 'green'),
+            (sell_points, 'Sell', 'triangle-down', 'red')
+        ):
+            if not points:
+                continue
+            point_ns = pd.DatetimeIndex([t for t, _ in points]).as_unit('ns').asi8
+            prices = np.fromiter((p for _, p in points), dtype=np.float64, count=len(points))
+            pos = np.minimum(np.searchsorted(idx_ns, point_ns), len(idx_ns) - 1)
+            fig.add_trace(
+                go.Scatter(
+                    x=df.index[pos],
+                    y=prices,
+                    mode='markers',
+                    name=label,
+                    marker=dict(symbol=symbol, size=12, color=color)
+                ),
+                row=1, col=1
+            )
+
         # Update layout
         fig.update_layout(
             title=f'{strategy_name}',
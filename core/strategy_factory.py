@@ -1,32 +1,47 @@
 import json
 import importlib
+import threading
 from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from typing import Dict, Type
 from core.strategy_interface import TradingStrategy
 
+_init_lock = threading.Lock()
+
 class StrategyFactory:
     """Factory for creating trading strategies"""
     _strategies: Dict[str, Type[TradingStrategy]] = {}
     _config_path = Path(__file__).parent.parent / 'strategies' / 'config.json'
     _initialized = False
     _display_info = {}
+    _instances: Dict[str, TradingStrategy] = {}
 
     @classmethod
     def _initialize(cls):
+        # Double-checked locking: the unlocked fast path keeps every call
+        # after the first lock-free, the locked re-check stops two threads
+        # from both parsing config.json and importing strategy modules
         if cls._initialized:
             return
-        with open(cls._config_path, 'r') as f:
-            config = json.load(f)
-        for entry in config:
-            name = entry['name']
-            description = entry.get('description', '')
-            module_name = f"strategies.{name.lower()}"
-            class_name = f"{name}Strategy"
-            module = importlib.import_module(module_name)
-            strategy_class = getattr(module, class_name)
-            cls._strategies[name.lower()] = strategy_class
-            cls._display_info[name.lower()] = {'name': name, 'description': description}
-        cls._initialized = True
+        with _init_lock:
+            if cls._initialized:
+                return
+            raw = cls._config_path.read_bytes()
+            config = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            for entry in config:
+                name = entry['name']
+                description = entry.get('description', '')
+                module_name = f"strategies.{name.lower()}"
+                class_name = f"{name}Strategy"
+                module = importlib.import_module(module_name)
+                strategy_class = getattr(module, class_name)
+                cls._strategies[name.lower()] = strategy_class
+                cls._display_info[name.lower()] = {'name': name, 'description': description}
+            cls._initialized = True
 
     @classmethod
     def register_strategy(cls, name: str, strategy_class: Type[TradingStrategy]):
@@ -36,10 +51,27 @@ class StrategyFactory:
     @classmethod
     def create_strategy(cls, name: str) -> TradingStrategy:
         cls._initialize()
+        # EAFP: the hit path is a single dict lookup, no membership probe
+        try:
+            return cls._strategies[name.lower()]()
+        except KeyError:
+            raise ValueError(f"Unknown strategy: {name}. Available strategies: {list(cls._strategies.keys())}") from None
+
+    @classmethod
+    def get_cached_strategy(cls, name: str) -> TradingStrategy:
+        """Shared per-process instance for read-only uses (config, listings).
+
+        Strategies can carry per-run state (e.g. the incremental EMA), so
+        anything that trades should keep calling create_strategy for a fresh
+        object.
+        """
         key = name.lower()
-        if key not in cls._strategies:
-            raise ValueError(f"Unknown strategy: {name}. Available strategies: {list(cls._strategies.keys())}")
-        return cls._strategies[key]()
+        try:
+            return cls._instances[key]
+        except KeyError:
+            instance = cls.create_strategy(key)
+            cls._instances[key] = instance
+            return instance
 
     @classmethod
     def list_strategies(cls) -> list[dict]:
@@ -48,5 +80,4 @@ class StrategyFactory:
 
     @classmethod
     def get_strategy_config(cls, name: str):
-        strategy = cls.create_strategy(name)
-        return strategy.get_config() 
\ No newline at end of file
+        return cls.get_cached_strategy(name).get_config()
\ No newline at end of file
@@ -1,10 +1,28 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, NamedTuple, Optional, Union
 from datetime import datetime
 from dataclasses import dataclass
+import numpy as np
 
+# Action codes for BuySignal
+HOLD = 0
+BUY = 1
 
-@dataclass
+
+class BuySignal(NamedTuple):
+    """Allocation-light buy decision; `action` is BUY or HOLD."""
+    action: int
+    info: str = ''
+
+
+class SellSignal(NamedTuple):
+    """Allocation-light sell decision."""
+    should_sell: bool
+    reason: str = ''
+    info: str = ''
+
+
+@dataclass(slots=True, frozen=True)
 class Candle:
     timestamp: datetime
     open: float
@@ -14,6 +32,81 @@ class Candle:
     volume: float
 
 
+@dataclass(slots=True)
+class CandleArrays:
+    """Structure-of-arrays candle window: float64 columns plus a timestamp list.
+
+    Behaves like a read-only sequence of Candle objects (len/index/slice/iter)
+    but indicators can read the columns directly without walking N dataclass
+    instances, and slicing is a NumPy view instead of N allocations.
+    """
+    timestamps: List[datetime]
+    opens: np.ndarray
+    highs: np.ndarray
+    lows: np.ndarray
+    closes: np.ndarray
+    volumes: np.ndarray
+
+    @classmethod
+    def from_candles(cls, candles: List[Candle]) -> 'CandleArrays':
+        n = len(candles)
+        return cls(
+            timestamps=[c.timestamp for c in candles],
+            opens=np.fromiter((c.open for c in candles), dtype=np.float64, count=n),
+            highs=np.fromiter((c.high for c in candles), dtype=np.float64, count=n),
+            lows=np.fromiter((c.low for c in candles), dtype=np.float64, count=n),
+            closes=np.fromiter((c.close for c in candles), dtype=np.float64, count=n),
+            volumes=np.fromiter((c.volume for c in candles), dtype=np.float64, count=n),
+        )
+
+    def as_candle(self, i: int) -> Candle:
+        """Materialize a single Candle object on demand."""
+        return Candle(
+            timestamp=self.timestamps[i],
+            open=float(self.opens[i]),
+            high=float(self.highs[i]),
+            low=float(self.lows[i]),
+            close=float(self.closes[i]),
+            volume=float(self.volumes[i]),
+        )
+
+    def to_candles(self) -> List[Candle]:
+        """Materialize the whole window as a list of Candle objects."""
+        return [self.as_candle(i) for i in range(len(self.timestamps))]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CandleArrays(
+                timestamps=self.timestamps[index],
+                opens=self.opens[index],
+                highs=self.highs[index],
+                lows=self.lows[index],
+                closes=self.closes[index],
+                volumes=self.volumes[index],
+            )
+        return self.as_candle(range(len(self))[index])
+
+    def __iter__(self):
+        return (self.as_candle(i) for i in range(len(self)))
+
+    def __add__(self, other: Union['CandleArrays', List[Candle]]) -> 'CandleArrays':
+        if isinstance(other, CandleArrays):
+            extra = other
+        else:
+            extra = CandleArrays.from_candles(other)
+        return CandleArrays(
+            timestamps=self.timestamps + extra.timestamps,
+            opens=np.concatenate((self.opens, extra.opens)),
+            highs=np.concatenate((self.highs, extra.highs)),
+            lows=np.concatenate((self.lows, extra.lows)),
+            closes=np.concatenate((self.closes, extra.closes)),
+            volumes=np.concatenate((self.volumes, extra.volumes)),
+        )
+
+
 @dataclass
 class Position:
     id: int
@@ -52,7 +145,9 @@ class TradingStrategy(ABC):
                 - lookback: List of historical candles
                 - curr: Current candle
                 - last_exit_time: Last exit time for cooldown
-        
+                - now: Engine-provided current time (candle time in
+                  backtests); strategies fall back to the wall clock
+
         Returns:
             Dictionary with 'action' ('buy', 'hold') and 'info'
         """
@@ -69,12 +164,29 @@ class TradingStrategy(ABC):
                 - curr: Current candle
                 - entry_price: Entry price
                 - entry_time: Entry time
+                - now: Engine-provided current time (candle time in
+                  backtests); strategies fall back to the wall clock
         
         Returns:
             Dictionary with 'shouldSell' (bool), 'reason' (str), and 'info' (str)
         """
         pass
-    
+
+    def get_backtest_kernel(self):
+        """
+        Optional compiled fast path for backtests.
+
+        Strategies whose rules are pure arithmetic over the close series can
+        return a callable (close, ts_ns, lookback) -> (entry_idx, exit_idx,
+        exit_reasons) that replays their entry/exit rules over the whole
+        series: float64 closes and int64 epoch-ns timestamps in, per-trade
+        entry/exit bar indices and reason strings (matching should_sell's)
+        out. The backtester dispatches on this hook's presence, so core
+        stays agnostic of any concrete strategy; the default None keeps the
+        interpreted per-candle loop.
+        """
+        return None
+
     def get_config(self) -> StrategyConfig:
         """Get the strategy configuration"""
         return self.config
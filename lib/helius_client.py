@@ -1,23 +1,108 @@
 import aiohttp
+import asyncio
 import json
 from typing import Dict, Any, List, Optional
+
+try:
+    # C-speed JSON decode for the large parsed-account responses; stdlib
+    # json is the fallback when orjson isn't installed
+    import orjson
+except ImportError:
+    orjson = None
 from solana.rpc.async_api import AsyncClient
 from solders.pubkey import Pubkey as PublicKey
 
 from utils.debugger import Debugger
 from utils.secrets import get_helius_api_key
 
+_shared_client: Optional['HeliusClient'] = None
+
+
+def get_shared_helius() -> 'HeliusClient':
+    """Process-wide HeliusClient so every caller shares one HTTP session
+    and one Solana RPC connection pool."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = HeliusClient()
+    return _shared_client
+
 
 class HeliusClient:
-    def __init__(self):
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
         self.api_key = get_helius_api_key()
         self.base_url = 'https://mainnet.helius-rpc.com'
         self.debug = Debugger.getInstance()
-    
+        # One keep-alive session per client (or an injected shared one)
+        # instead of a fresh TLS handshake + DNS lookup per request
+        self._session = session
+        self._owns_session = session is None
+        self._connection: Optional[AsyncClient] = None
+        # Micro-batch state for get_token_details_batched: callers landing
+        # inside the same 20 ms window share one getAssetBatch round trip
+        self._meta_pending: Dict[str, asyncio.Future] = {}
+        self._meta_flush_task: Optional[asyncio.Task] = None
+
+    def use_session(self, session: aiohttp.ClientSession) -> None:
+        """Adopt a shared session owned (and closed) by the caller."""
+        self._session = session
+        self._owns_session = False
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=60),
+                # Explicit gzip keeps the JSON-heavy route-plan/account
+                # payloads small on the wire; aiohttp decompresses inline
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept-Encoding": "gzip, deflate",
+                    "User-Agent": "maix-strategy/1.0"
+                },
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+            self._owns_session = True
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session if this client owns it."""
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _post_json(self, request_body: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a JSON-RPC body and return the decoded response."""
+        session = self._get_session()
+        if orjson is not None:
+            post_kwargs = {'data': orjson.dumps(request_body)}
+        else:
+            post_kwargs = {'json': request_body}
+        async with session.post(
+            f"{self.base_url}/?api-key={self.api_key}",
+            **post_kwargs
+        ) as response:
+            if not response.ok:
+                raise Exception(f"Helius API Error: {response.status}")
+
+            raw = await response.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            if "error" in data:
+                raise Exception(f"Helius API Error: {data['error']['message']}")
+
+            return data
+
     def get_connection(self) -> AsyncClient:
-        """Returns a Solana RPC client using the Helius endpoint and API key."""
-        return AsyncClient(f"{self.base_url}/?api-key={self.api_key}")
-    
+        """Returns a Solana RPC client using the Helius endpoint and API key.
+
+        Cached per client so repeated callers share one connection pool
+        instead of each holding their own.
+        """
+        if self._connection is None:
+            self._connection = AsyncClient(f"{self.base_url}/?api-key={self.api_key}")
+        return self._connection
+
+    def get_ws_url(self) -> str:
+        """WebSocket endpoint for pub/sub subscriptions (signatureSubscribe etc.)."""
+        return f"wss://mainnet.helius-rpc.com/?api-key={self.api_key}"
+
     async def get_transaction_details(self, signature: str) -> Dict[str, Any]:
         """Get transaction details from Helius API."""
         try:
@@ -33,25 +118,13 @@ class HeliusClient:
                     }
                 ]
             }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/?api-key={self.api_key}",
-                    headers={"Content-Type": "application/json"},
-                    json=request_body
-                ) as response:
-                    if not response.ok:
-                        raise Exception(f"Helius API Error: {response.status}")
-                    
-                    data = await response.json()
-                    if "error" in data:
-                        raise Exception(f"Helius API Error: {data['error']['message']}")
-                    
-                    return data.get("result", {})
+
+            data = await self._post_json(request_body)
+            return data.get("result", {})
         except Exception as e:
             self.debug.error(f"Error fetching transaction details: {e}")
             raise
-    
+
     async def get_token_details(self, mint_address: str) -> Dict[str, Any]:
         """Get token metadata from Helius API."""
         try:
@@ -66,32 +139,79 @@ class HeliusClient:
                     }
                 }
             }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/?api-key={self.api_key}",
-                    headers={"Content-Type": "application/json"},
-                    json=request_body
-                ) as response:
-                    if not response.ok:
-                        raise Exception(f"Helius API Error: {response.status}")
-                    
-                    data = await response.json()
-                    if "error" in data:
-                        raise Exception(f"Helius API Error: {data['error']['message']}")
-                    
-                    result = data.get("result", {})
-                    return {
-                        "name": result.get("content", {}).get("metadata", {}).get("name", ""),
-                        "symbol": result.get("content", {}).get("metadata", {}).get("symbol", ""),
-                        "decimals": result.get("token_info", {}).get("decimals", 0),
-                        "supply": result.get("token_info", {}).get("supply", 0),
-                        "image": result.get("content", {}).get("links", {}).get("image", "")
-                    }
+
+            data = await self._post_json(request_body)
+            result = data.get("result", {})
+            return {
+                "name": result.get("content", {}).get("metadata", {}).get("name", ""),
+                "symbol": result.get("content", {}).get("metadata", {}).get("symbol", ""),
+                "decimals": result.get("token_info", {}).get("decimals", 0),
+                "supply": result.get("token_info", {}).get("supply", 0),
+                "image": result.get("content", {}).get("links", {}).get("image", "")
+            }
         except Exception as e:
             self.debug.error(f"Error fetching token metadata: {e}")
             raise
-    
+
+    async def get_token_details_batch(self, mint_addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get metadata for several mints in one getAssetBatch RPC."""
+        try:
+            request_body = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getAssetBatch",
+                "params": {
+                    "ids": mint_addresses,
+                    "displayOptions": {
+                        "showFungible": True
+                    }
+                }
+            }
+
+            data = await self._post_json(request_body)
+            details = {}
+            for mint, result in zip(mint_addresses, data.get("result", [])):
+                result = result or {}
+                details[mint] = {
+                    "name": result.get("content", {}).get("metadata", {}).get("name", ""),
+                    "symbol": result.get("content", {}).get("metadata", {}).get("symbol", ""),
+                    "decimals": result.get("token_info", {}).get("decimals", 0),
+                    "supply": result.get("token_info", {}).get("supply", 0),
+                    "image": result.get("content", {}).get("links", {}).get("image", "")
+                }
+            return details
+        except Exception as e:
+            self.debug.error(f"Error fetching batched token metadata: {e}")
+            raise
+
+    async def get_token_details_batched(self, mint_address: str) -> Dict[str, Any]:
+        """Like get_token_details, but coalesces concurrent callers.
+
+        Requests arriving within the same 20 ms window are drained into a
+        single getAssetBatch call, so N simultaneous lookups cost one HTTP
+        round trip instead of N.
+        """
+        fut = self._meta_pending.get(mint_address)
+        if fut is None:
+            fut = asyncio.get_running_loop().create_future()
+            self._meta_pending[mint_address] = fut
+            if self._meta_flush_task is None or self._meta_flush_task.done():
+                self._meta_flush_task = asyncio.ensure_future(self._flush_token_meta())
+        return await fut
+
+    async def _flush_token_meta(self):
+        await asyncio.sleep(0.02)
+        pending, self._meta_pending = self._meta_pending, {}
+        try:
+            details = await self.get_token_details_batch(list(pending))
+            for mint, fut in pending.items():
+                if not fut.done():
+                    fut.set_result(details[mint])
+        except Exception as e:
+            for fut in pending.values():
+                if not fut.done():
+                    fut.set_exception(e)
+
     async def get_sol_balance(self, public_key: str) -> int:
         """Get SOL balance in lamports."""
         try:
@@ -101,25 +221,13 @@ class HeliusClient:
                 "method": "getBalance",
                 "params": [public_key]
             }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/?api-key={self.api_key}",
-                    headers={"Content-Type": "application/json"},
-                    json=request_body
-                ) as response:
-                    if not response.ok:
-                        raise Exception(f"Helius API Error: {response.status}")
-                    
-                    data = await response.json()
-                    if "error" in data:
-                        raise Exception(f"Helius API Error: {data['error']['message']}")
-                    
-                    return data.get("result", {}).get("value", 0)
+
+            data = await self._post_json(request_body)
+            return data.get("result", {}).get("value", 0)
         except Exception as e:
             self.debug.error(f"Error fetching SOL balance: {e}")
             raise
-    
+
     async def get_all_token_balances_for_wallet(self, public_key: str) -> List[Dict[str, Any]]:
         """Get all SPL token balances for a wallet."""
         try:
@@ -134,7 +242,7 @@ class HeliusClient:
                     {"encoding": "jsonParsed"}
                 ]
             }
-            
+
             # Get Metaplex token accounts
             metaplex_request_body = {
                 "jsonrpc": "2.0",
@@ -146,71 +254,40 @@ class HeliusClient:
                     {"encoding": "jsonParsed"}
                 ]
             }
-            
-            async with aiohttp.ClientSession() as session:
-                # Get SPL token accounts
-                async with session.post(
-                    f"{self.base_url}/?api-key={self.api_key}",
-                    headers={"Content-Type": "application/json"},
-                    json=spl_request_body
-                ) as response:
-                    if not response.ok:
-                        raise Exception(f"Helius API Error: {response.status}")
-                    
-                    spl_data = await response.json()
-                    spl_accounts = spl_data.get("result", {}).get("value", [])
-                
-                # Get Metaplex token accounts
-                async with session.post(
-                    f"{self.base_url}/?api-key={self.api_key}",
-                    headers={"Content-Type": "application/json"},
-                    json=metaplex_request_body
-                ) as response:
-                    if not response.ok:
-                        raise Exception(f"Helius API Error: {response.status}")
-                    
-                    metaplex_data = await response.json()
-                    metaplex_accounts = metaplex_data.get("result", {}).get("value", [])
-                
-                # Combine all token accounts
-                all_accounts = spl_accounts + metaplex_accounts
-                
-                # Get balances for each token account
-                balances = []
-                for account in all_accounts:
-                    try:
-                        token_account_address = account["pubkey"]
-                        mint = account["account"]["data"]["parsed"]["info"]["mint"]
-                        
-                        # Get balance for this token account
-                        balance_request_body = {
-                            "jsonrpc": "2.0",
-                            "id": 1,
-                            "method": "getTokenAccountBalance",
-                            "params": [token_account_address]
-                        }
-                        
-                        async with session.post(
-                            f"{self.base_url}/?api-key={self.api_key}",
-                            headers={"Content-Type": "application/json"},
-                            json=balance_request_body
-                        ) as balance_response:
-                            if balance_response.ok:
-                                balance_data = await balance_response.json()
-                                amount = balance_data.get("result", {}).get("value", {}).get("uiAmount", 0)
-                                decimals = balance_data.get("result", {}).get("value", {}).get("decimals", 0)
-                                
-                                balances.append({
-                                    "mint": mint,
-                                    "amount": amount,
-                                    "decimals": decimals,
-                                    "tokenAccount": token_account_address
-                                })
-                    except Exception as e:
-                        self.debug.error(f"Error processing token account {account.get('pubkey', 'unknown')}: {e}")
+
+            # The two account lookups are independent; overlap their round trips
+            spl_data, metaplex_data = await asyncio.gather(
+                self._post_json(spl_request_body),
+                self._post_json(metaplex_request_body)
+            )
+            spl_accounts = spl_data.get("result", {}).get("value", [])
+            metaplex_accounts = metaplex_data.get("result", {}).get("value", [])
+
+            # Combine all token accounts
+            all_accounts = spl_accounts + metaplex_accounts
+
+            # With encoding=jsonParsed the account payload already carries
+            # tokenAmount, so no follow-up getTokenAccountBalance round trip
+            # per account is needed
+            balances = []
+            for account in all_accounts:
+                try:
+                    info = account["account"]["data"]["parsed"]["info"]
+                    token_amount = info["tokenAmount"]
+                    # Dust/closed accounts carry no balance worth reporting
+                    if (token_amount.get("uiAmount") or 0) <= 0:
                         continue
-                
-                return balances
+                    balances.append({
+                        "mint": info["mint"],
+                        "amount": token_amount.get("uiAmount", 0),
+                        "decimals": token_amount.get("decimals", 0),
+                        "tokenAccount": account["pubkey"]
+                    })
+                except Exception as e:
+                    self.debug.error(f"Error processing token account {account.get('pubkey', 'unknown')}: {e}")
+                    continue
+
+            return balances
         except Exception as e:
             self.debug.error(f"Error fetching token balances: {e}")
-            raise 
\ No newline at end of file
+            raise
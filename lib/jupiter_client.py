@@ -1,28 +1,89 @@
 import aiohttp
+import asyncio
 import base58
-from typing import Dict, Any, Optional
+import json
+import time
+from dataclasses import dataclass
+
+try:
+    # C-speed JSON for the large route-plan/swap-transaction payloads;
+    # stdlib json is the fallback when orjson isn't installed
+    import orjson
+except ImportError:
+    orjson = None
+from typing import Dict, Any, List, Literal, Optional, Tuple, Union
 from solders.keypair import Keypair
 from solders.transaction import Transaction
 from solders.commitment_config import CommitmentConfig
 
 from utils.debugger import Debugger
-from lib.helius_client import HeliusClient
+from lib.helius_client import HeliusClient, get_shared_helius
+
+
+@dataclass(slots=True, frozen=True)
+class SwapOptions:
+    """
+    Landing-rate knobs for Jupiter swaps.
+
+    The defaults favour landing during congestion: preflight skipped and
+    retries handled app-side with backoff instead of by the RPC node.
+    With use_dynamic_slippage the /swap endpoint re-estimates slippage
+    server-side at swap time and sets minOut from that estimate, bounded
+    by dynamic_slippage_max_bps; the quote's fixed cap applies otherwise.
+    """
+    priority_level: Literal['low', 'medium', 'high', 'veryHigh', 'unsafeMax'] = 'high'
+    max_priority_fee_lamports: int = 1_000_000
+    skip_preflight: bool = True
+    confirmation_commitment: str = 'confirmed'
+    use_dynamic_slippage: bool = False
+    dynamic_slippage_max_bps: int = 5000
+    restrict_intermediate_tokens: bool = True
+
+
+_DEFAULT_SWAP_OPTIONS = SwapOptions()
 
 
 class JupiterClient:
-    def __init__(self):
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
         self.debug = Debugger.getInstance()
-        self.helius_client = HeliusClient()
+        # Without an injected session, share the process-wide HeliusClient
+        # so multiple JupiterClients don't each hold their own RPC pool
+        self.helius_client = HeliusClient(session=session) if session is not None else get_shared_helius()
         self.connection = self.helius_client.get_connection()
         self.quote_url = 'https://lite-api.jup.ag/swap/v1/quote'
         self.swap_url = 'https://lite-api.jup.ag/swap/v1/swap'
-    
+        # Mint decimals are immutable, so one lookup per mint per process;
+        # per-mint locks keep concurrent sells from duplicating the fetch
+        self._decimals_cache: Dict[str, int] = {}
+        self._decimals_locks: Dict[str, asyncio.Lock] = {}
+        # The wallet is constant across a strategy loop; decode base58 and
+        # derive the Keypair once per public key instead of per swap
+        self._keypair_cache: Dict[str, Keypair] = {}
+        # Swap body fields are invariant for a given SwapOptions; build the
+        # template once per options value instead of per call
+        self._swap_body_templates: Dict[SwapOptions, Dict[str, Any]] = {}
+
+    def use_session(self, session: aiohttp.ClientSession) -> None:
+        """Adopt a shared session owned (and closed) by the caller."""
+        self.helius_client.use_session(session)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Jupiter and Helius calls share one keep-alive session, so quote,
+        # swap and balance requests reuse warm connections
+        return self.helius_client._get_session()
+
+    async def close(self) -> None:
+        """Close the underlying session if this client owns it."""
+        await self.helius_client.close()
+
+
     async def get_quote(
         self,
         input_mint: str,
         output_mint: str,
         amount: str,
-        slippage_bps: int = 50
+        slippage_bps: int = 50,
+        options: SwapOptions = _DEFAULT_SWAP_OPTIONS
     ) -> Dict[str, Any]:
         """Get a quote from Jupiter API."""
         try:
@@ -31,68 +92,164 @@ class JupiterClient:
                 'outputMint': output_mint,
                 'amount': amount,
                 'slippageBps': str(slippage_bps),
-                'restrictIntermediateTokens': 'true'
+                'restrictIntermediateTokens': 'true' if options.restrict_intermediate_tokens else 'false'
             }
             
             self.debug.info('Jupiter /quote request params:', params)
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.quote_url, params=params) as response:
-                    if not response.ok:
-                        raise Exception(f"Jupiter API Error: {response.status}")
-                    
-                    data = await response.json()
-                    return data
+
+            session = self._get_session()
+            async with session.get(self.quote_url, params=params) as response:
+                if not response.ok:
+                    raise Exception(f"Jupiter API Error: {response.status}")
+
+                raw = await response.read()
+                return orjson.loads(raw) if orjson is not None else json.loads(raw)
         except Exception as e:
             self.debug.error(f"Error getting Jupiter quote: {e}")
             raise
     
+    async def get_quotes_batch(
+        self,
+        specs: List[Tuple[str, str, str, int]],
+        timeout: float = 20.0
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Fetch several quotes concurrently over the shared session.
+
+        Args:
+            specs: (input_mint, output_mint, amount, slippage_bps) tuples
+            timeout: Per-quote timeout in seconds
+
+        Returns:
+            One entry per spec, in order: the quote dict, or the exception
+            that request raised. Total wall time is the slowest quote, not
+            the sum.
+        """
+        return await asyncio.gather(
+            *[asyncio.wait_for(self.get_quote(*spec), timeout) for spec in specs],
+            return_exceptions=True
+        )
+
     async def get_swap_transaction(
         self,
         quote_response: Dict[str, Any],
-        user_public_key: str
+        user_public_key: str,
+        options: SwapOptions = _DEFAULT_SWAP_OPTIONS
     ) -> Dict[str, Any]:
         """Get swap transaction from Jupiter API."""
         try:
-            request_body = {
-                'quoteResponse': quote_response,
-                'userPublicKey': user_public_key,
-                'wrapUnwrapSOL': True,
-                'asLegacyTransaction': False,
-                'dynamicComputeUnitLimit': True,
-                'dynamicSlippage': True,
-                'prioritizationFeeLamports': {
-                    'priorityLevelWithMaxLamports': {
-                        'maxLamports': 1000000,
-                        'priorityLevel': 'veryHigh'
+            template = self._swap_body_templates.get(options)
+            if template is None:
+                template = {
+                    'wrapUnwrapSOL': True,
+                    'asLegacyTransaction': False,
+                    'dynamicComputeUnitLimit': True,
+                    'dynamicSlippage': (
+                        {'maxBps': options.dynamic_slippage_max_bps}
+                        if options.use_dynamic_slippage else False
+                    ),
+                    'prioritizationFeeLamports': {
+                        'priorityLevelWithMaxLamports': {
+                            'maxLamports': options.max_priority_fee_lamports,
+                            'priorityLevel': options.priority_level
+                        }
                     }
                 }
+                self._swap_body_templates[options] = template
+            request_body = {
+                **template,
+                'quoteResponse': quote_response,
+                'userPublicKey': user_public_key
             }
             
-            self.debug.info('Jupiter /swap request payload:', request_body)
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.swap_url,
-                    headers={'Content-Type': 'application/json'},
-                    json=request_body
-                ) as response:
-                    if not response.ok:
-                        raise Exception(f"Jupiter API Error: {response.status}")
-                    
-                    data = await response.json()
-                    return data
+            # The full body drags the route plan through str(); log only the
+            # fields worth eyeballing
+            self.debug.info('Jupiter /swap request:', {
+                'userPublicKey': user_public_key,
+                'priorityLevel': options.priority_level,
+                'dynamicSlippage': options.use_dynamic_slippage
+            })
+
+            session = self._get_session()
+            if orjson is not None:
+                post_kwargs = {'data': orjson.dumps(request_body)}
+            else:
+                post_kwargs = {'json': request_body}
+            async with session.post(
+                self.swap_url,
+                headers={'Content-Type': 'application/json'},
+                **post_kwargs
+            ) as response:
+                if not response.ok:
+                    raise Exception(f"Jupiter API Error: {response.status}")
+
+                raw = await response.read()
+                return orjson.loads(raw) if orjson is not None else json.loads(raw)
         except Exception as e:
             self.debug.error(f"Error getting Jupiter swap transaction: {e}")
             raise
     
+    async def _await_signature_via_ws(self, signature, commitment: str = 'confirmed', timeout: float = 30.0):
+        """
+        Wait for a signature to reach 'confirmed' via signatureSubscribe.
+
+        One push arrives about a slot after the transaction lands, instead of
+        the getSignatureStatuses polling loop behind confirm_transaction.
+        Returns the on-chain err value (None on success); raises on transport
+        problems or timeout so the caller can fall back to polling.
+        """
+        from solana.rpc.websocket_api import connect
+
+        async with connect(self.helius_client.get_ws_url()) as ws:
+            await ws.signature_subscribe(signature, commitment=commitment)
+            while True:
+                frames = await asyncio.wait_for(ws.recv(), timeout)
+                if not isinstance(frames, list):
+                    frames = [frames]
+                for frame in frames:
+                    # The subscription ack carries an int result; the
+                    # notification carries result.value.err
+                    value = getattr(getattr(frame, 'result', None), 'value', None)
+                    if value is not None and hasattr(value, 'err'):
+                        return value.err
+
+    async def _await_confirmation(self, signature, commitment: str = 'confirmed', timeout: float = 60.0):
+        """
+        Poll getSignatureStatuses with exponential backoff (500 ms growing
+        to a 3.5 s cap) until the signature reaches the target commitment.
+
+        Fallback for when signatureSubscribe is unavailable; far fewer RPC
+        calls than confirm_transaction's fixed-interval polling. Returns
+        the on-chain err value (None on success); raises on timeout.
+        """
+        target = ('confirmed', 'finalized') if commitment == 'confirmed' else ('finalized',)
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while True:
+            resp = await self.connection.get_signature_statuses([signature])
+            status = resp.value[0]
+            if status is not None:
+                if status.err is not None:
+                    return status.err
+                # solders stringifies the enum capitalized
+                # (TransactionConfirmationStatus.Confirmed), so compare
+                # case-insensitively
+                confirmation_status = str(getattr(status, 'confirmation_status', '') or '').lower()
+                if any(t in confirmation_status for t in target):
+                    return None
+            if time.monotonic() >= deadline:
+                raise Exception(f"Transaction confirmation timed out: {signature}")
+            await asyncio.sleep(min(3.5, 0.5 * 1.5 ** attempt))
+            attempt += 1
+
     async def swap(
         self,
         wallet: Dict[str, str],
         input_mint: str,
         output_mint: str,
         amount: str,
-        slippage_bps: int = 50
+        slippage_bps: int = 50,
+        options: SwapOptions = _DEFAULT_SWAP_OPTIONS
     ) -> Dict[str, Any]:
         """Swap tokens using Jupiter."""
         try:
@@ -102,8 +259,8 @@ class JupiterClient:
                 'amount': amount,
                 'slippageBps': slippage_bps
             })
-            
-            quote = await self.get_quote(input_mint, output_mint, amount, slippage_bps)
+
+            quote = await self.get_quote(input_mint, output_mint, amount, slippage_bps, options)
             
             self.debug.info('Quote received:', {
                 'inputAmount': quote.get('inAmount'),
@@ -111,35 +268,56 @@ class JupiterClient:
                 'priceImpact': quote.get('priceImpactPct')
             })
             
-            swap_response = await self.get_swap_transaction(quote, wallet['publicKey'])
+            swap_response = await self.get_swap_transaction(quote, wallet['publicKey'], options)
             
             # Deserialize and sign transaction
             transaction_data = base58.b58decode(swap_response['swapTransaction'])
             transaction = Transaction.deserialize(transaction_data)
             
-            keypair = Keypair.from_secret_key(base58.b58decode(wallet['secretKey']))
+            keypair = self._keypair_cache.get(wallet['publicKey'])
+            if keypair is None:
+                keypair = Keypair.from_secret_key(base58.b58decode(wallet['secretKey']))
+                self._keypair_cache[wallet['publicKey']] = keypair
             transaction.sign(keypair)
             
             self.debug.info('Sending swap transaction...')
             
-            signature = await self.connection.send_transaction(
-                transaction,
-                opts={
-                    'skipPreflight': False,
-                    'preflightCommitment': 'confirmed',
-                    'maxRetries': 3
-                }
-            )
-            
+            # maxRetries=0 keeps the RPC node from blind-rebroadcasting; the
+            # app-level backoff below retries with full visibility instead
+            for attempt in range(3):
+                try:
+                    signature = await self.connection.send_transaction(
+                        transaction,
+                        opts={
+                            'skipPreflight': options.skip_preflight,
+                            'preflightCommitment': options.confirmation_commitment,
+                            'maxRetries': 0
+                        }
+                    )
+                    break
+                except Exception as send_error:
+                    if attempt == 2:
+                        raise
+                    delay = 0.5 * (2 ** attempt)
+                    self.debug.info(f'send_transaction failed ({send_error}); retrying in {delay}s')
+                    await asyncio.sleep(delay)
+
             self.debug.info('Swap transaction sent:', {'signature': signature.value})
-            
-            confirmation = await self.connection.confirm_transaction(
-                signature.value,
-                'confirmed'
-            )
-            
-            if confirmation.value.err:
-                raise Exception(f"Transaction failed: {confirmation.value.err}")
+
+            try:
+                err = await self._await_signature_via_ws(
+                    signature.value,
+                    options.confirmation_commitment
+                )
+            except Exception as ws_error:
+                self.debug.info(f'signatureSubscribe unavailable ({ws_error}); falling back to polling')
+                err = await self._await_confirmation(
+                    signature.value,
+                    options.confirmation_commitment
+                )
+
+            if err:
+                raise Exception(f"Transaction failed: {err}")
             
             self.debug.info('Swap transaction confirmed:', {'signature': signature.value})
             
@@ -153,14 +331,15 @@ class JupiterClient:
         wallet: Dict[str, str],
         token_mint: str,
         sol_amount: float,
-        slippage_bps: int = 50
+        slippage_bps: int = 50,
+        options: SwapOptions = _DEFAULT_SWAP_OPTIONS
     ) -> Dict[str, Any]:
         """Buy a token using SOL as input."""
         sol_mint = 'So11111111111111111111111111111111111111112'
         amount_in_lamports = str(int(sol_amount * 1e9))
-        
+
         # Execute the swap and get both signature and quote
-        result = await self.swap(wallet, sol_mint, token_mint, amount_in_lamports, slippage_bps)
+        result = await self.swap(wallet, sol_mint, token_mint, amount_in_lamports, slippage_bps, options)
         
         return {
             'signature': result['signature'],
@@ -172,18 +351,32 @@ class JupiterClient:
         wallet: Dict[str, str],
         token_mint: str,
         token_amount: float,
-        slippage_bps: int = 50
+        slippage_bps: int = 50,
+        options: SwapOptions = _DEFAULT_SWAP_OPTIONS
     ) -> str:
         """Sell a token for SOL."""
         sol_mint = 'So11111111111111111111111111111111111111112'
-        
-        # Get decimals for the token
-        token_meta = await self.helius_client.get_token_details(token_mint)
-        amount_in_base_units = str(int(token_amount * (10 ** token_meta['decimals'])))
-        
-        result = await self.swap(wallet, token_mint, sol_mint, amount_in_base_units, slippage_bps)
+
+        decimals = await self._get_decimals(token_mint)
+        amount_in_base_units = str(int(token_amount * (10 ** decimals)))
+
+        result = await self.swap(wallet, token_mint, sol_mint, amount_in_base_units, slippage_bps, options)
         return result['signature']
     
+    async def _get_decimals(self, mint: str) -> int:
+        """Mint decimals via a single-flight per-mint cache."""
+        try:
+            return self._decimals_cache[mint]
+        except KeyError:
+            pass
+        lock = self._decimals_locks.setdefault(mint, asyncio.Lock())
+        async with lock:
+            # A concurrent sell may have populated the cache while we waited
+            if mint not in self._decimals_cache:
+                token_meta = await self.helius_client.get_token_details_batched(mint)
+                self._decimals_cache[mint] = token_meta['decimals']
+            return self._decimals_cache[mint]
+
     def get_connection(self):
         """Get the Solana connection."""
-        return self.connection 
\ No newline at end of file
+        return self.connection
\ No newline at end of file
@@ -0,0 +1,13 @@
+-- Wakes the executor when a new 1s candle lands, instead of blind polling.
+-- Apply once per database: psql "$DATABASE_URL" -f prisma/ohlcv_notify.sql
+
+CREATE OR REPLACE FUNCTION notify_ohlcv_insert() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('ohlcv_' || NEW."tokenId", NEW."timestamp"::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS ohlcv_notify ON "TokenOHLCV";
+CREATE TRIGGER ohlcv_notify AFTER INSERT ON "TokenOHLCV"
+    FOR EACH ROW EXECUTE FUNCTION notify_ohlcv_insert();
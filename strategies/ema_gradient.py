@@ -1,8 +1,114 @@
 from typing import Dict, Any
-from datetime import datetime, timedelta
-import pytz
+from datetime import datetime, timedelta, timezone
+import numpy as np
 from core.strategy_interface import TradingStrategy, StrategyConfig, Candle, Position
-from core.indicators.ema import calculate_ema
+from core.indicators.ema import IncrementalEMA
+from core.kernels import njit
+
+# Hoisted out of the per-tick paths: stdlib UTC beats the pytz attribute
+# lookup and timedelta construction is not free at tick rate
+UTC = timezone.utc
+_COOLDOWN = timedelta(minutes=5)
+_MAX_HOLD = timedelta(minutes=45)
+
+# Exit reason codes returned by the compiled loop, decoded to the same
+# reason strings should_sell emits
+_REASON_STOP_LOSS = 0
+_REASON_TAKE_PROFIT = 1
+_REASON_GRADIENT_NEGATIVE = 2
+_REASON_TIME_EXIT = 3
+_REASON_END_OF_BACKTEST = 4
+
+_REASON_LABELS = {
+    _REASON_STOP_LOSS: 'stop_loss',
+    _REASON_TAKE_PROFIT: 'take_profit',
+    _REASON_GRADIENT_NEGATIVE: 'ema_gradient_negative',
+    _REASON_TIME_EXIT: 'time_exit',
+    _REASON_END_OF_BACKTEST: 'End of backtest',
+}
+
+
+@njit(cache=True)
+def _ema_gradient_loop(
+    close: np.ndarray,
+    ts_ns: np.ndarray,
+    lookback: int,
+    ema_period: int,
+    gradient_threshold: float,
+    stop_loss_pct: float,
+    take_profit_pct: float,
+    max_hold_ns: int,
+    cooldown_ns: int,
+):
+    """Compiled replay of this strategy's entry/exit rules over a series.
+
+    The EMA is seeded from the first lookback window exactly like
+    IncrementalEMA.seed, then advanced one multiply-add per bar — the same
+    continuous recursion the interpreted path computes on rolling windows.
+    Timing rules (cooldown, max hold) use candle timestamps. Returns
+    (entry_idx, exit_idx, reason_code) arrays, one element per trade.
+    """
+    n = close.shape[0]
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    reason_code = np.empty(n, dtype=np.int64)
+    count = 0
+    in_position = False
+    entry_i = -1
+    entry_price = 0.0
+    last_exit_ns = np.int64(-1)
+    multiplier = 2.0 / (ema_period + 1.0)
+    # The first decision window close[0:lookback+1] must hold period + 2
+    # values, mirroring the guard in _calculate_ema_gradient
+    have_ema = lookback + 1 >= ema_period + 2
+    ema = 0.0
+    prev_ema = 0.0
+    if have_ema:
+        sma = 0.0
+        for i in range(ema_period):
+            sma += close[i]
+        ema = sma / ema_period
+        for i in range(ema_period, lookback + 1):
+            prev_ema = ema
+            ema = close[i] * multiplier + ema * (1.0 - multiplier)
+    for i in range(lookback, n):
+        if have_ema and i > lookback:
+            prev_ema = ema
+            ema = close[i] * multiplier + ema * (1.0 - multiplier)
+        gradient = 0.0
+        if have_ema and prev_ema != 0.0:
+            gradient = (ema - prev_ema) / prev_ema
+        if in_position:
+            pnl_pct = (close[i] - entry_price) / entry_price * 100.0
+            reason = -1
+            if pnl_pct < stop_loss_pct:
+                reason = _REASON_STOP_LOSS
+            elif pnl_pct > take_profit_pct:
+                reason = _REASON_TAKE_PROFIT
+            elif gradient < -gradient_threshold:
+                reason = _REASON_GRADIENT_NEGATIVE
+            elif ts_ns[i] - ts_ns[entry_i] > max_hold_ns:
+                reason = _REASON_TIME_EXIT
+            if reason >= 0:
+                entry_idx[count] = entry_i
+                exit_idx[count] = i
+                reason_code[count] = reason
+                count += 1
+                in_position = False
+                last_exit_ns = ts_ns[i]
+        else:
+            cooldown_ok = last_exit_ns < 0 or ts_ns[i] - last_exit_ns > cooldown_ns
+            if cooldown_ok and gradient > gradient_threshold:
+                in_position = True
+                entry_i = i
+                entry_price = close[i]
+    if in_position:
+        entry_idx[count] = entry_i
+        exit_idx[count] = n - 1
+        reason_code[count] = _REASON_END_OF_BACKTEST
+        count += 1
+    return entry_idx[:count], exit_idx[:count], reason_code[:count]
+
 
 class EMA_GradientStrategy(TradingStrategy):
     """EMA Gradient strategy: buys on positive EMA gradient, sells on negative gradient or profit targets."""
@@ -22,19 +128,32 @@ class EMA_GradientStrategy(TradingStrategy):
         super().__init__(config)
         self.ema_period = 20
         self.gradient_threshold = 0.001  # Minimum gradient to trigger buy
+        # Exit parameters, read by the backtest kernel as well — keep them
+        # here so the compiled and interpreted paths can't drift apart
+        self.stop_loss_pct = -5.0
+        self.take_profit_pct = 10.0
+        self.cooldown = _COOLDOWN
+        self.max_hold = _MAX_HOLD
+        self._inc_ema = IncrementalEMA(self.ema_period)
 
     def _calculate_ema_gradient(self, candles: list) -> float:
         """Calculate the current EMA gradient (rate of change)."""
         if len(candles) < self.ema_period + 2:
             return 0.0
-        
-        ema_values = calculate_ema(candles, self.ema_period)
-        if len(ema_values) < 2:
-            return 0.0
-        
-        # Calculate gradient as (current_ema - previous_ema) / previous_ema
-        current_ema = ema_values[-1][1]
-        previous_ema = ema_values[-2][1]
+
+        # On a rolling window only the last candle is new (or still forming),
+        # so advance the cached EMA state in O(1); any other shape reseeds
+        # from the full series
+        inc = self._inc_ema
+        if inc.last_ts in (candles[-1].timestamp, candles[-2].timestamp):
+            current_ema = inc.update(candles[-1])
+            previous_ema = inc.prev_ema
+        else:
+            inc.seed(candles)
+            if inc.last_ts is None:
+                return 0.0
+            current_ema = inc.last_ema
+            previous_ema = inc.prev_ema
         
         if previous_ema == 0:
             return 0.0
@@ -57,7 +176,10 @@ class EMA_GradientStrategy(TradingStrategy):
         gradient = self._calculate_ema_gradient(all_candles)
         
         # Check cooldown period
-        cooldown_ok = last_exit_time is None or (datetime.now(pytz.UTC) - last_exit_time) > timedelta(minutes=5)
+        # Engine-injected clock: one read per tick, and deterministic in
+        # backtests where 'now' is the candle time
+        now = data.get('now') or datetime.now(UTC)
+        cooldown_ok = last_exit_time is None or (now - last_exit_time) > self.cooldown
         
         # Buy signal: positive gradient above threshold and cooldown passed
         if gradient > self.gradient_threshold and cooldown_ok:
@@ -83,7 +205,8 @@ class EMA_GradientStrategy(TradingStrategy):
         
         # Calculate PnL
         pnl_pct = ((curr.close - entry_price) / entry_price) * 100
-        time_held = datetime.now(pytz.UTC) - entry_time
+        now = data.get('now') or datetime.now(UTC)
+        time_held = now - entry_time
         
         # Calculate current EMA gradient
         all_candles = lookback + [curr]
@@ -91,7 +214,7 @@ class EMA_GradientStrategy(TradingStrategy):
         
         # Sell conditions:
         # 1. Stop loss: -5% loss
-        if pnl_pct < -5:
+        if pnl_pct < self.stop_loss_pct:
             return {
                 'shouldSell': True, 
                 'reason': 'stop_loss', 
@@ -99,7 +222,7 @@ class EMA_GradientStrategy(TradingStrategy):
             }
         
         # 2. Take profit: +10% gain
-        if pnl_pct > 10:
+        if pnl_pct > self.take_profit_pct:
             return {
                 'shouldSell': True, 
                 'reason': 'take_profit', 
@@ -115,7 +238,7 @@ class EMA_GradientStrategy(TradingStrategy):
             }
         
         # 4. Time-based exit: hold for max 45 minutes
-        if time_held > timedelta(minutes=45):
+        if time_held > self.max_hold:
             return {
                 'shouldSell': True, 
                 'reason': 'time_exit', 
@@ -123,7 +246,24 @@ class EMA_GradientStrategy(TradingStrategy):
             }
         
         return {
-            'shouldSell': False, 
-            'reason': 'hold', 
+            'shouldSell': False,
+            'reason': 'hold',
             'info': f'PnL: {pnl_pct:.2f}%, EMA gradient: {gradient:.4f}'
-        } 
\ No newline at end of file
+        }
+
+    def get_backtest_kernel(self):
+        """Compiled fast path for the backtester; see TradingStrategy."""
+        def kernel(close, ts_ns, lookback):
+            entry_idx, exit_idx, reason_code = _ema_gradient_loop(
+                close,
+                ts_ns,
+                lookback,
+                self.ema_period,
+                self.gradient_threshold,
+                self.stop_loss_pct,
+                self.take_profit_pct,
+                int(self.max_hold.total_seconds() * 1e9),
+                int(self.cooldown.total_seconds() * 1e9),
+            )
+            return entry_idx, exit_idx, [_REASON_LABELS[int(c)] for c in reason_code]
+        return kernel
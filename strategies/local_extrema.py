@@ -0,0 +1,143 @@
+from typing import Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from core.strategy_interface import TradingStrategy, StrategyConfig, Candle, Position
+from core.kernels import is_local_min_last, is_local_max_last
+
+# Hoisted out of the per-tick paths: stdlib UTC beats the pytz attribute
+# lookup and timedelta construction is not free at tick rate
+UTC = timezone.utc
+_COOLDOWN = timedelta(minutes=10)
+_MAX_HOLD = timedelta(hours=2)
+
+
+def find_local_extrema(closes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized local-extrema scan for backtest/tuning use.
+
+    Returns (minima_mask, maxima_mask) over the interior points, detected
+    from sign changes of the first difference in one NumPy pass instead of
+    a per-index Python loop.
+    """
+    d = np.sign(np.diff(closes))
+    minima = np.zeros(len(closes), dtype=bool)
+    maxima = np.zeros(len(closes), dtype=bool)
+    minima[1:-1] = (d[:-1] < 0) & (d[1:] > 0)
+    maxima[1:-1] = (d[:-1] > 0) & (d[1:] < 0)
+    return minima, maxima
+
+
+class LocalExtremaStrategy(TradingStrategy):
+    """Local extrema strategy: buys into sustained declines (forming local minima), sells into sustained rallies (forming local maxima)."""
+
+    def __init__(self):
+        config = StrategyConfig(
+            name="Local_Extrema",
+            token_id=15156,
+            lookback_periods=50,
+            balance_percentage=0.4,
+            default_slippage_bps=400,
+            min_trade_size_sol=0.001,
+            fee_buffer_sol=0.01,
+            rent_buffer_sol=0.002,
+            loop_delay_ms=1000
+        )
+        super().__init__(config)
+        self.min_change_pct = 0.01  # Minimum move into the extremum to act on
+        self.stop_loss_pct = -5.0
+        self.take_profit_pct = 10.0
+
+    def _last_closes(self, lookback, curr: Candle) -> np.ndarray:
+        """Last three closes as a float64 array (no full-window copy)."""
+        return np.array(
+            [lookback[-2].close, lookback[-1].close, curr.close],
+            dtype=np.float64
+        )
+
+    # At the live edge there is no right neighbour, so "local minimum" means
+    # two consecutive declines with a meaningful last leg; the checks live in
+    # core.kernels so backtests get the compiled versions
+    _is_last_local_min = staticmethod(is_local_min_last)
+    _is_last_local_max = staticmethod(is_local_max_last)
+
+    def should_buy(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        lookback = data.get('lookback', [])
+        curr = data.get('curr')
+        last_exit_time = data.get('last_exit_time')
+
+        if curr is None or len(lookback) < 2:
+            return {'action': 'hold', 'info': 'Insufficient data for extrema detection'}
+
+        # Engine-injected clock: one read per tick, and deterministic in
+        # backtests where 'now' is the candle time
+        now = data.get('now') or datetime.now(UTC)
+        if last_exit_time is not None and (now - last_exit_time) < _COOLDOWN:
+            return {'action': 'hold', 'info': f'In cooldown period ({_COOLDOWN.total_seconds() / 60:.0f} min after exit)'}
+
+        closes = self._last_closes(lookback, curr)
+        if self._is_last_local_min(closes, self.min_change_pct):
+            return {
+                'action': 'buy',
+                'info': f'Local minimum detected at {curr.close:.6f}'
+            }
+
+        return {'action': 'hold', 'info': f'No local minimum detected at {curr.close:.6f}'}
+
+    def should_sell(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        position = data.get('position')
+        curr = data.get('curr')
+        entry_price = data.get('entry_price')
+        entry_time = data.get('entry_time')
+        lookback = data.get('lookback', [])
+
+        if not position or not curr or entry_price is None or entry_time is None:
+            return {'shouldSell': False, 'reason': 'Missing data', 'info': ''}
+
+        pnl_pct = ((curr.close - entry_price) / entry_price) * 100
+        now = data.get('now') or datetime.now(UTC)
+        time_held = now - entry_time
+
+        # 1. Stop loss
+        if pnl_pct < self.stop_loss_pct:
+            return {
+                'shouldSell': True,
+                'reason': 'stop_loss',
+                'info': f'Stop loss triggered: {pnl_pct:.2f}%'
+            }
+
+        # 2. Local maximum: exit into strength before the profit cap bites
+        if len(lookback) >= 2:
+            closes = self._last_closes(lookback, curr)
+            if self._is_last_local_max(closes, self.min_change_pct):
+                return {
+                    'shouldSell': True,
+                    'reason': 'local_maximum',
+                    'info': f'Local maximum detected at {curr.close:.6f} (PnL: {pnl_pct:.2f}%)'
+                }
+
+        # 3. Take profit
+        if pnl_pct > self.take_profit_pct:
+            return {
+                'shouldSell': True,
+                'reason': 'take_profit',
+                'info': f'Take profit triggered: {pnl_pct:.2f}%'
+            }
+
+        # 4. Time-based exit
+        if time_held > _MAX_HOLD:
+            return {
+                'shouldSell': True,
+                'reason': 'time_exit',
+                'info': f'Time exit: held {time_held.total_seconds()/3600:.1f} h'
+            }
+
+        return {
+            'shouldSell': False,
+            'reason': 'hold',
+            'info': f'PnL: {pnl_pct:.2f}%'
+        }
+
+
+# Alias matching the StrategyFactory naming convention ({Name}Strategy for
+# config name "Local_Extrema")
+Local_ExtremaStrategy = LocalExtremaStrategy
@@ -0,0 +1,14 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def sample_data_15158():
+    """Parse tests/helper/sample_data.json once per pytest session.
+
+    Every plotter test reads the same token-15158 sample; session scope
+    means one disk read and JSON parse for the whole suite instead of one
+    per fixture instantiation. Imported lazily so tests that never touch
+    the sample don't pull in the prisma-backed fetch path.
+    """
+    from tests.helper.load_data import load_sample_candles
+    return load_sample_candles(15158)
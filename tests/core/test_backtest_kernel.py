@@ -0,0 +1,154 @@
+import unittest
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from core.backtest_kernel import build_equity_curve, candles_to_arrays
+from core.strategy_interface import Candle, Position
+from strategies.ema_gradient import EMA_GradientStrategy
+
+
+def make_candles(closes, start, step):
+    return [
+        Candle(
+            timestamp=start + step * i,
+            open=float(c),
+            high=float(c),
+            low=float(c),
+            close=float(c),
+            volume=1000.0,
+        )
+        for i, c in enumerate(closes)
+    ]
+
+
+def run_interpreted_loop(strategy, candles, lookback):
+    """Replay the strategy through engine-style payloads, bar by bar.
+
+    Mirrors the decision loop in core.backtest.Backtester.run_backtest
+    (sell first when in a position, buy otherwise, candle time as 'now')
+    without the Prisma dependency, so the compiled kernel can be checked
+    against what the interpreted engine would trade.
+    """
+    trades = []
+    position = None
+    last_exit_time = None
+    for i in range(lookback, len(candles)):
+        curr = candles[i]
+        window = candles[i - lookback:i]
+        if position is not None:
+            signal = strategy.should_sell({
+                'position': position,
+                'curr': curr,
+                'entry_price': position.entry_price,
+                'entry_time': position.entry_time,
+                'lookback': window,
+                'now': curr.timestamp,
+            })
+            if signal['shouldSell']:
+                trades.append((position.id, i, signal['reason']))
+                last_exit_time = curr.timestamp
+                position = None
+        else:
+            signal = strategy.should_buy({
+                'lookback': window,
+                'curr': curr,
+                'last_exit_time': last_exit_time,
+                'now': curr.timestamp,
+            })
+            if signal['action'] == 'buy':
+                # Reuse the Position id field to carry the entry bar index
+                position = Position(id=i, entry_price=curr.close, entry_time=curr.timestamp, size=1.0)
+    if position is not None:
+        trades.append((position.id, len(candles) - 1, 'End of backtest'))
+    return trades
+
+
+class TestEmaGradientKernelEquivalence(unittest.TestCase):
+    """The compiled EMA-gradient loop must trade exactly like the strategy
+    run through the interpreted engine — any divergence means backtests no
+    longer simulate live behaviour."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Seeded random walk with a slow sine trend, volatile enough to
+        # exercise stop-loss/take-profit exits as well as gradient flips
+        rng = np.random.default_rng(42)
+        n = 2000
+        t = np.arange(n)
+        closes = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.02, n)) + 0.08 * np.sin(t / 60.0))
+        cls.candles = make_candles(
+            closes, datetime(2025, 1, 1, tzinfo=timezone.utc), timedelta(minutes=1)
+        )
+
+    def test_kernel_matches_interpreted_loop(self):
+        strategy = EMA_GradientStrategy()
+        lookback = strategy.get_config().lookback_periods
+        _, _, _, close, _, ts_ns = candles_to_arrays(self.candles)
+
+        kernel = strategy.get_backtest_kernel()
+        self.assertIsNotNone(kernel)
+        entry_idx, exit_idx, reasons = kernel(close, ts_ns, lookback)
+        kernel_trades = list(zip(entry_idx.tolist(), exit_idx.tolist(), reasons))
+
+        # Fresh instance: the interpreted run must not share IncrementalEMA state
+        interpreted_trades = run_interpreted_loop(EMA_GradientStrategy(), self.candles, lookback)
+
+        self.assertEqual(kernel_trades, interpreted_trades)
+        # Guard the fixture itself: a quiet series that never trades (or only
+        # ever exits one way) would make the equality above vacuous
+        self.assertGreater(len(kernel_trades), 20)
+        reason_counts = Counter(reasons)
+        self.assertIn('ema_gradient_negative', reason_counts)
+        self.assertIn('stop_loss', reason_counts)
+        self.assertIn('take_profit', reason_counts)
+
+    def test_kernel_reports_no_trades_without_enough_history(self):
+        strategy = EMA_GradientStrategy()
+        # Lookback window too short for the EMA guard: gradient stays 0.0,
+        # so no entry can ever trigger
+        lookback = strategy.ema_period - 1
+        _, _, _, close, _, ts_ns = candles_to_arrays(self.candles[:200])
+        entry_idx, exit_idx, reasons = strategy.get_backtest_kernel()(close, ts_ns, lookback)
+        self.assertEqual(len(entry_idx), 0)
+        self.assertEqual(len(exit_idx), 0)
+        self.assertEqual(reasons, [])
+
+
+class TestBuildEquityCurve(unittest.TestCase):
+
+    def test_matches_per_bar_reference(self):
+        rng = np.random.default_rng(7)
+        n = 500
+        lookback = 50
+        close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        # Synthetic non-overlapping trades scattered over the series
+        entry_idx = np.array([60, 120, 300, 420], dtype=np.int64)
+        exit_idx = np.array([95, 180, 390, 499], dtype=np.int64)
+        sizes = np.ones(entry_idx.shape[0], dtype=np.float64)
+        initial_capital = 1000.0
+
+        equity = build_equity_curve(close, lookback, initial_capital, entry_idx, exit_idx, sizes)
+
+        expected = np.empty(n - lookback, dtype=np.float64)
+        for j, bar in enumerate(range(lookback, n)):
+            value = initial_capital
+            for k in range(entry_idx.shape[0]):
+                if exit_idx[k] < bar:
+                    value += (close[exit_idx[k]] - close[entry_idx[k]]) * sizes[k]
+                elif entry_idx[k] < bar <= exit_idx[k]:
+                    value += (close[bar] - close[entry_idx[k]]) * sizes[k]
+            expected[j] = value
+        np.testing.assert_allclose(equity, expected)
+
+    def test_no_trades_is_flat_at_initial_capital(self):
+        close = np.linspace(100.0, 110.0, 80)
+        empty = np.empty(0, dtype=np.int64)
+        equity = build_equity_curve(close, 20, 1000.0, empty, empty, np.empty(0))
+        self.assertEqual(equity.shape[0], 60)
+        self.assertTrue(np.all(equity == 1000.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
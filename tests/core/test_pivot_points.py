@@ -0,0 +1,81 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from core.indicators.pivot_points import calculate_pivot_points
+from core.strategy_interface import Candle
+
+
+def brute_force_pivots(highs, lows, window):
+    """O(N*window) reference: a pivot high is strictly above every other high
+    within `window` bars on each side; pivot lows are symmetric."""
+    n = len(highs)
+    support, resistance = [], []
+    for i in range(window, n - window):
+        if highs[i] > highs[i - window:i].max() and highs[i] > highs[i + 1:i + window + 1].max():
+            resistance.append(i)
+        if lows[i] < lows[i - window:i].min() and lows[i] < lows[i + 1:i + window + 1].min():
+            support.append(i)
+    return support, resistance
+
+
+def make_candles(highs, lows, start, step):
+    return [
+        Candle(
+            timestamp=start + step * i,
+            open=float((h + l) / 2),
+            high=float(h),
+            low=float(l),
+            close=float((h + l) / 2),
+            volume=1000.0,
+        )
+        for i, (h, l) in enumerate(zip(highs, lows))
+    ]
+
+
+class TestPivotKernel(unittest.TestCase):
+    """The monotonic-deque pivot kernel must agree with the brute-force
+    definition it replaced, for every window size."""
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(1234)
+        n = 400
+        mid = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        spread = np.abs(rng.normal(0.5, 0.2, n)) + 0.05
+        cls.highs = mid + spread
+        cls.lows = mid - spread
+        cls.candles = make_candles(
+            cls.highs, cls.lows, datetime(2025, 1, 1, tzinfo=timezone.utc), timedelta(seconds=1)
+        )
+
+    def test_matches_brute_force_across_windows(self):
+        for window in (1, 2, 5, 10, 25):
+            with self.subTest(window=window):
+                support, resistance = calculate_pivot_points(self.candles, window=window)
+                exp_support, exp_resistance = brute_force_pivots(self.highs, self.lows, window)
+                self.assertEqual(
+                    support,
+                    [(self.candles[i].timestamp, float(self.lows[i])) for i in exp_support],
+                )
+                self.assertEqual(
+                    resistance,
+                    [(self.candles[i].timestamp, float(self.highs[i])) for i in exp_resistance],
+                )
+
+    def test_points_come_out_timestamp_sorted(self):
+        support, resistance = calculate_pivot_points(self.candles, window=5)
+        self.assertGreater(len(support), 0)
+        self.assertGreater(len(resistance), 0)
+        self.assertEqual(support, sorted(support))
+        self.assertEqual(resistance, sorted(resistance))
+
+    def test_series_too_short_for_window_yields_no_pivots(self):
+        support, resistance = calculate_pivot_points(self.candles[:10], window=5)
+        self.assertEqual(support, [])
+        self.assertEqual(resistance, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,18 +2,17 @@ import pytest
 from core.plotter import plot_trading_signals
 from tests.helper.load_data import load_sample_candles
 
-@pytest.fixture
-def sample_data():
-    """Load real sample candle data and token meta for testing"""
-    candles = load_sample_candles(15158)
-    return candles
+@pytest.fixture(scope="session")
+def sample_data(sample_data_15158):
+    """Real sample candle data and token meta (parsed once per session)"""
+    return sample_data_15158
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_candles(sample_data):
     """Extract candles from sample data"""
     return sample_data[0]
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def token_meta(sample_data):
     """Extract token meta from sample data"""
     return sample_data[1]
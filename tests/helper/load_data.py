@@ -1,3 +1,4 @@
+import functools
 import json
 import os
 import sys
@@ -10,8 +11,13 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 from core.strategy_interface import Candle
 from tests.helper.fetch_data import fetch_token_data
 
+@functools.lru_cache(maxsize=4)
 def load_sample_candles(token_id=15158):
-    """Load sample candles from saved JSON data"""
+    """Load sample candles from saved JSON data.
+
+    Cached per token_id: repeat callers share one parsed (candles,
+    token_meta) pair, so treat the returned list as read-only.
+    """
     file_path = "tests/helper/sample_data.json"
     
     if not os.path.exists(file_path):
@@ -321,4 +321,10 @@ async def main():
 
 
 if __name__ == "__main__":
+    try:
+        # uvloop cuts asyncio scheduling overhead in the trading loop
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main()) 
\ No newline at end of file
@@ -38,9 +38,22 @@ class Debugger:
     @classmethod
     def getInstance(cls) -> 'Debugger':
         return cls()
-    
-    def info(self, message: str, data: Optional[Dict[str, Any]] = None):
-        """Log info message with optional data"""
+
+    def is_info_enabled(self) -> bool:
+        """True when INFO records would actually be emitted."""
+        return self.logger.isEnabledFor(logging.INFO)
+
+    def info(self, message: str, data: Optional[Any] = None):
+        """Log info message with optional data.
+
+        `data` may be a zero-arg callable; it is only invoked (and the
+        message only formatted) when INFO is enabled, so hot paths can log
+        large payloads without paying for them when logging is off.
+        """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        if callable(data):
+            data = data()
         if data:
             self.logger.info(f"{message} {data}")
         else:
@@ -60,8 +73,12 @@ class Debugger:
         else:
             self.logger.warning(message)
     
-    def debug(self, message: str, data: Optional[Dict[str, Any]] = None):
-        """Log debug message with optional data"""
+    def debug(self, message: str, data: Optional[Any] = None):
+        """Log debug message with optional data (callable data is lazy)."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        if callable(data):
+            data = data()
         if data:
             self.logger.debug(f"{message} {data}")
         else:
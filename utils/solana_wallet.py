@@ -7,7 +7,7 @@ from solders.system_program import TransferParams, transfer
 from solders.commitment_config import CommitmentConfig
 
 from .debugger import Debugger
-from lib.helius_client import HeliusClient
+from lib.helius_client import get_shared_helius
 
 
 def get_wallet_for_telegram_chat(prisma, chat_id: str):
@@ -50,7 +50,7 @@ def create_wallet_for_telegram_chat(prisma, chat_id: str):
 async def get_sol_balance_and_usd(public_key: str) -> Dict[str, float]:
     """Returns the SOL balance, USD value, and SOL price for a given public key."""
     try:
-        helius = HeliusClient()
+        helius = get_shared_helius()
         balance_lamports = await helius.get_sol_balance(public_key)
         balance_in_sol = balance_lamports / 1e9
         
@@ -76,7 +76,7 @@ async def send_sol(
 ) -> str:
     """Sends SOL from the sender's wallet to the specified address."""
     try:
-        helius = HeliusClient()
+        helius = get_shared_helius()
         connection = helius.get_connection()
         
         sender_keypair = Keypair.from_secret_key(
@@ -107,7 +107,7 @@ async def send_sol(
 async def get_max_withdrawable_sol(public_key: str) -> float:
     """Returns the maximum amount of SOL that can be withdrawn from an account."""
     try:
-        helius = HeliusClient()
+        helius = get_shared_helius()
         connection = helius.get_connection()
         
         balance_lamports = await connection.get_balance(PublicKey(public_key))
@@ -126,7 +126,7 @@ async def get_max_withdrawable_sol(public_key: str) -> float:
 async def get_token_balance_and_usd(public_key: str) -> List[Dict[str, Any]]:
     """Returns the token balances for a given public key."""
     try:
-        helius = HeliusClient()
+        helius = get_shared_helius()
         token_balances = await helius.get_all_token_balances_for_wallet(public_key)
         
         result = []